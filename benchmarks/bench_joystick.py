@@ -0,0 +1,130 @@
+"""Topside benchmarks: axis mapping, command encoding and full controller ticks."""
+import tempfile
+import time
+from pathlib import Path
+
+import yaml
+
+import joystick.controller as controller_module
+from joystick.comms.serial_link import SerialLink, ServoCommand, STATUS_HEADER
+from joystick.comms.transport import Transport
+from joystick.controller import JoystickController
+from joystick.mapping import AxisConfig, AxisMapper
+from joystick.reader import JoystickState
+
+NUM_AXES = 4
+
+
+class NullTransport(Transport):
+    """Answers the STATUS handshake and discards everything written."""
+
+    def __init__(self):
+        self._lines = []
+        self.timeout = 0.1
+        self.bytes_written = 0
+
+    @property
+    def name(self) -> str:
+        return "null"
+
+    def open(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+    def write(self, data: bytes) -> None:
+        self.bytes_written += len(data)
+        if data == b"STATUS\n":
+            self._lines.append(STATUS_HEADER.encode("ascii") + b"\r\n")
+
+    def readline(self) -> bytes:
+        if self._lines:
+            return self._lines.pop(0)
+        # Block like a real port, or the receive thread spins and skews timings
+        time.sleep(self.timeout)
+        return b""
+
+    def set_timeout(self, timeout: float) -> None:
+        self.timeout = timeout
+
+
+class SweepReader:
+    """Reader whose axes sweep back and forth, so every tick has changes."""
+
+    def __init__(self, num_axes: int):
+        self.num_axes = num_axes
+        self.step = 0
+
+    def read(self) -> JoystickState:
+        self.step = (self.step + 1) % 200
+        value = abs(self.step - 100) / 50 - 1.0
+        return JoystickState(axes=[value] * self.num_axes, buttons=[], hats=[])
+
+    def close(self) -> None:
+        pass
+
+
+def axis_configs() -> list[dict]:
+    return [
+        {
+            "name": f"axis{i}",
+            "axis_index": i,
+            "target_servo_id": i + 1,
+            "output_min": -100,
+            "output_max": 100,
+            "epsilon": 1,
+        }
+        for i in range(NUM_AXES)
+    ]
+
+
+def make_controller(full_state: bool) -> JoystickController:
+    """JoystickController on a SweepReader and a SerialLink over NullTransport."""
+    config = {
+        "joystick": {"device_index": 0},
+        "serial": {"port": "null", "baudrate": 115200, "send_rate_hz": 30, "full_state": full_state},
+        "reload": {"enabled": False},
+        "axes": axis_configs(),
+    }
+    path = Path(tempfile.mkdtemp()) / "config.yaml"
+    path.write_text(yaml.safe_dump(config))
+
+    create_reader = controller_module.create_reader
+    create_serial_link = controller_module.create_serial_link
+    controller_module.create_reader = lambda config: SweepReader(NUM_AXES)
+    controller_module.create_serial_link = (
+        lambda serial_config, recorder=None: SerialLink(transport=NullTransport())
+    )
+    try:
+        return JoystickController(path)
+    finally:
+        controller_module.create_reader = create_reader
+        controller_module.create_serial_link = create_serial_link
+
+
+def benchmarks() -> dict:
+    mapper = AxisMapper([AxisConfig.from_dict(c) for c in axis_configs()])
+    raw_axes = [0.3, -0.7, 0.0, 1.0]
+    mapped = mapper.process_axes(raw_axes)
+    last_name = f"axis{NUM_AXES - 1}"
+    mapper.should_send(last_name, 0.0)
+
+    command = ServoCommand(1, 45, 50)
+    commands = [ServoCommand(i + 1, 10 * i, 50) for i in range(NUM_AXES)]
+    link = SerialLink(transport=NullTransport())
+
+    changes = make_controller(full_state=False)
+    full_state = make_controller(full_state=True)
+
+    return {
+        "mapping.process_axes": lambda: mapper.process_axes(raw_axes),
+        # Worst case lookup: the last configured axis, unchanged value
+        "mapping.should_send": lambda: mapper.should_send(last_name, 0.0),
+        "mapping.should_send_all": lambda: [mapper.should_send(n, v) for n, v in mapped.items()],
+        "protocol.servo_to_message": command.to_message,
+        "protocol.send_command": lambda: link.send_command(command),
+        "protocol.send_commands_batch": lambda: link.send_commands(commands),
+        "controller.tick_changes": changes.tick,
+        "controller.tick_full_state": full_state.tick,
+    }
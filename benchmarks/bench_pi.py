@@ -0,0 +1,25 @@
+"""Pi benchmarks: PCA9685 frame encoding against the in-memory chip (no bus timing)."""
+from src.actuators.servo import Servo
+from src.drivers.fake_pca9685 import FakeI2CBus, FakePCA9685
+from src.drivers.pwm_controller import NUM_CHANNELS, PWMController
+
+
+def benchmarks() -> dict:
+    pwm = PWMController(backend=FakePCA9685(FakeI2CBus(simulate_timing=False)))
+    servos = [Servo(pwm, channel) for channel in range(NUM_CHANNELS)]
+    frames = [
+        {s.channel: s.duty(value) for s in servos}
+        for value in (-0.5, 0.5)
+    ]
+    unchanged = frames[0]
+    state = {"i": 0}
+
+    def full_frame():
+        state["i"] ^= 1
+        pwm.set_duties(frames[state["i"]])
+
+    return {
+        "pwm.set_duties_16ch": full_frame,
+        "pwm.set_duties_unchanged": lambda: pwm.set_duties(unchanged),
+        "actuator.update_duty": lambda: servos[0].duty(servos[0].update(0.02)),
+    }
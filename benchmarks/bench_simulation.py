@@ -0,0 +1,24 @@
+"""Simulation benchmarks: PID step, plant step and full simulation runs."""
+from main import run_simulation
+from model import PID
+from sil import Plant
+
+
+def benchmarks() -> dict:
+    pid = PID(kp=1.25, ki=0.1025, kd=0.0125, limit=10.0)
+    plant = Plant()
+    plant.set_target_depth(10.0)
+
+    def plant_step():
+        plant.step()
+        # Keep the recorded history from growing for the whole run
+        if len(plant.history['time']) >= 10000:
+            for values in plant.history.values():
+                values.clear()
+
+    return {
+        "sim.pid_compute": lambda: pid.compute(10.0, 4.2, 0.05),
+        "sim.plant_step": plant_step,
+        # 60 s of simulated time at dt = 0.05 (1200 steps)
+        "sim.run_simulation": run_simulation,
+    }
@@ -0,0 +1,152 @@
+"""
+Benchmark runner for the control, protocol and simulation hot paths.
+
+    python benchmarks/run.py                 # run all, compare to baselines
+    python benchmarks/run.py -k mapping      # only names containing "mapping"
+    python benchmarks/run.py --update        # re-record baselines.json
+
+Each benchmark is a zero-argument callable doing one operation. It is run
+in batches sized to take about BATCH_SECONDS, REPEATS times, and the
+fastest batch gives the time per operation (the minimum is the least
+noisy estimate on a busy machine).
+
+Results are compared in units of a fixed pure-Python calibration loop
+timed right before each benchmark, so a machine that is slower or faster
+than when the baselines were recorded (CPU frequency scaling, a busy CI
+host) does not show up as a regression. A benchmark regresses when it is
+more than its threshold (default DEFAULT_THRESHOLD) times slower than
+its baseline in CONFIRM_RUNS consecutive measurements; the runner then
+exits with status 1.
+
+Baselines are still best recorded on the machine you compare on. Commit
+updated numbers together with the change that moved them.
+"""
+import argparse
+import json
+import platform
+import sys
+import timeit
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+BASELINES = Path(__file__).resolve().parent / "baselines.json"
+
+DEFAULT_THRESHOLD = 1.3
+BATCH_SECONDS = 0.2
+REPEATS = 7
+# Measurements a benchmark must fail in a row before it counts as regressed
+CONFIRM_RUNS = 3
+
+# Run against the working tree without installing anything
+sys.path[:0] = [
+    str(ROOT / "controls" / "joystick" / "src"),
+    str(ROOT / "rasberry_pi"),
+    str(ROOT / "simulations" / "pid"),
+]
+
+import bench_joystick  # noqa: E402
+import bench_pi  # noqa: E402
+import bench_simulation  # noqa: E402
+
+SUITES = (bench_joystick, bench_pi, bench_simulation)
+
+
+def measure(fn) -> float:
+    """Seconds per call of fn (best batch of REPEATS)."""
+    timer = timeit.Timer(fn)
+    number, elapsed = timer.autorange()
+    number = max(1, int(number * BATCH_SECONDS / max(elapsed, 1e-9)))
+    return min(timer.repeat(repeat=REPEATS, number=number)) / number
+
+
+def calibration() -> int:
+    """Fixed interpreter workload (arithmetic, calls, dicts) used as the time unit."""
+    table = {}
+    total = 0
+    for i in range(1000):
+        table[i & 63] = i * 3 + 1
+        total += abs(table[i & 63] - i)
+    return total
+
+
+def measure_relative(fn) -> tuple[float, float]:
+    """(seconds per call, seconds per call in calibration units)."""
+    unit = measure(calibration)
+    seconds = measure(fn)
+    return seconds, seconds / unit
+
+
+def format_time(seconds: float) -> str:
+    for unit, scale in (("s", 1.0), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:8.2f} {unit}"
+    return f"{seconds / 1e-9:8.0f} ns"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("-k", dest="pattern", help="only run benchmarks whose name contains this")
+    parser.add_argument("--update", action="store_true", help="write the results to baselines.json")
+    args = parser.parse_args()
+
+    data = json.loads(BASELINES.read_text()) if BASELINES.exists() else {}
+    baselines = data.get("benchmarks", {})
+
+    benchmarks = {}
+    for suite in SUITES:
+        benchmarks.update(suite.benchmarks())
+
+    results = {}
+    regressions = []
+    print(f"{'benchmark':<36} {'time/op':>11} {'baseline':>11} {'ratio':>6}")
+    for name, fn in benchmarks.items():
+        if args.pattern and args.pattern not in name:
+            continue
+        baseline = baselines.get(name)
+        if baseline is None or args.update:
+            # Median of several runs, so one noisy calibration can't skew a baseline
+            runs = sorted(
+                (measure_relative(fn) for _ in range(CONFIRM_RUNS)),
+                key=lambda run: run[1],
+            )
+            seconds, relative = runs[len(runs) // 2]
+            results[name] = (seconds, relative)
+            print(f"{name:<36} {format_time(seconds)} {'-':>11} {'-':>6}")
+            continue
+
+        seconds, relative = measure_relative(fn)
+
+        threshold = baseline.get("threshold", DEFAULT_THRESHOLD)
+        ratio = relative / baseline["relative"]
+        # A single slow measurement is usually a noisy neighbour; only
+        # report it if it reproduces
+        for _ in range(CONFIRM_RUNS - 1):
+            if ratio <= threshold:
+                break
+            seconds, relative = measure_relative(fn)
+            ratio = min(ratio, relative / baseline["relative"])
+
+        flag = ""
+        if ratio > threshold:
+            flag = f"  REGRESSION (> {threshold:.2f}x)"
+            regressions.append(name)
+        elif ratio < 1 / threshold:
+            flag = "  faster, consider --update"
+        print(f"{name:<36} {format_time(seconds)} {format_time(baseline['seconds'])} {ratio:6.2f}{flag}")
+
+    if args.update:
+        for name, (seconds, relative) in results.items():
+            entry = baselines.setdefault(name, {})
+            entry["seconds"] = seconds
+            entry["relative"] = relative
+        data["machine"] = f"{platform.machine()} {platform.processor() or platform.system()}, Python {platform.python_version()}"
+        data["benchmarks"] = dict(sorted(baselines.items()))
+        BASELINES.write_text(json.dumps(data, indent=2) + "\n")
+        print(f"Updated {len(results)} baselines in {BASELINES.name}")
+    elif regressions:
+        print(f"{len(regressions)} regression(s): {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,12 +4,14 @@ __version__ = "0.1.0"
 
 from joystick.controller import JoystickController
 from joystick.reader import JoystickReader, JoystickState
+from joystick.hub import InputHub
 from joystick.mapping import AxisConfig, AxisMapper
 
 __all__ = [
     "JoystickController",
     "JoystickReader",
     "JoystickState",
+    "InputHub",
     "AxisConfig",
     "AxisMapper",
 ]
@@ -1,10 +1,27 @@
 """Communication modules for serial links."""
 
-from joystick.comms.serial_link import SerialLink, Command, ServoCommand, MotorCommand
+from joystick.comms.serial_link import (
+    SerialLink,
+    Command,
+    ServoCommand,
+    MotorCommand,
+    StatusCommand,
+)
+from joystick.comms.transport import (
+    Transport,
+    SerialTransport,
+    UdpTransport,
+    LinkStats,
+)
 
 __all__ = [
     "SerialLink",
     "Command",
     "ServoCommand",
     "MotorCommand",
+    "StatusCommand",
+    "Transport",
+    "SerialTransport",
+    "UdpTransport",
+    "LinkStats",
 ]
@@ -1,8 +1,11 @@
 import logging
-import serial
 import threading
 import time
 from abc import ABC, abstractmethod
+from collections.abc import Sequence
+
+from joystick.comms.transport import SerialTransport, Transport
+from joystick.telemetry.sinks import TelemetrySink
 
 
 logger = logging.getLogger(__name__)
@@ -15,6 +18,27 @@ class Command(ABC):
     def to_message(self) -> str:
         """Convert the command to a message string to send over serial."""
         pass
+    
+    def target_key(self) -> tuple[str, int] | None:
+        """
+        Identify the device this command targets.
+        
+        Commands with the same key supersede each other, so only the latest
+        one per key needs to be resent after a reconnect.
+        
+        Returns:
+            (command type, device ID), or None for commands without a target
+        """
+        return None
+    
+    def telemetry(self) -> list[tuple[str, float]]:
+        """
+        Numeric values to record when the command is sent.
+        
+        Returns:
+            (channel name, value) pairs
+        """
+        return []
 
 
 class ServoCommand(Command):
@@ -35,6 +59,12 @@ class ServoCommand(Command):
     
     def to_message(self) -> str:
         return f"SERVO,{self.servo_id},angle,{self.angle},time,{self.move_time_ms}\n"
+    
+    def target_key(self) -> tuple[str, int]:
+        return ("SERVO", self.servo_id)
+    
+    def telemetry(self) -> list[tuple[str, float]]:
+        return [(f"servo_{self.servo_id}_target", self.angle)]
 
 
 class MotorCommand(Command):
@@ -53,25 +83,119 @@ class MotorCommand(Command):
     
     def to_message(self) -> str:
         return f"MOTOR,{self.motor_id},speed,{self.speed}\n"
+    
+    def target_key(self) -> tuple[str, int]:
+        return ("MOTOR", self.motor_id)
+    
+    def telemetry(self) -> list[tuple[str, float]]:
+        return [(f"motor_{self.motor_id}_target", self.speed)]
+
+
+class StatusCommand(Command):
+    """Command asking the ESP32 to print the status of all devices."""
+    
+    def to_message(self) -> str:
+        return "STATUS\n"
+
+
+# First and last line the ESP32 prints in response to STATUS (see
+# DeviceManager::printStatus)
+STATUS_HEADER = "=== Device Status ==="
+STATUS_FOOTER = "===================="
 
 
 class SerialLink:
-    """Manages serial communication with the ESP32."""
+    """
+    Sends commands to the actuator controller (ESP32 or Pi runtime).
+    
+    The link runs over a Transport: USB serial by default, or UDP on the
+    tether Ethernet. The receive thread doubles as a connection
+    supervisor: when the transport fails (e.g. the USB adapter resets) it
+    reopens it with exponential backoff and resends the last command for
+    every servo/motor once the device answers STATUS again. Commands sent
+    while the link is down are dropped, not queued.
     
-    def __init__(self, port: str, baudrate: int = 115200, timeout: float = 0.1):
+    A serial port reports a failure itself, but a UDP link does not: a
+    dead peer just goes quiet. With heartbeat_interval set, the link
+    sends STATUS at that interval and treats HEARTBEAT_MISSES intervals
+    without any received line as a failure.
+    """
+    
+    # Interval between STATUS probes while waiting for the device to answer
+    READY_POLL_INTERVAL = 0.05
+    # Reconnect backoff bounds in seconds
+    RECONNECT_BACKOFF_MIN = 0.05
+    RECONNECT_BACKOFF_MAX = 2.0
+    # Heartbeat intervals without a reply before the link counts as down
+    HEARTBEAT_MISSES = 3
+    
+    def __init__(
+        self,
+        port: str | None = None,
+        baudrate: int = 115200,
+        timeout: float = 0.1,
+        ready_timeout: float = 5.0,
+        vid: int | None = None,
+        pid: int | None = None,
+        transport: Transport | None = None,
+        recorder: TelemetrySink | None = None,
+        heartbeat_interval: float | None = None,
+    ):
         """
-        Initialize serial connection to ESP32.
+        Initialize the link and wait for the device to answer.
         
         Args:
-            port: Serial port path (e.g., "/dev/ttyUSB0")
+            port: Serial port path (e.g., "/dev/ttyUSB0"); ignored if a
+                transport is given
             baudrate: Communication baud rate
             timeout: Read timeout in seconds
+            ready_timeout: Maximum time in seconds to wait for the device
+                to answer a STATUS request
+            vid: USB vendor ID of the serial adapter. If set together with
+                pid, the port is located by VID/PID instead of by path.
+            pid: USB product ID of the serial adapter
+            transport: Transport to use instead of a serial port
+            recorder: Records sent commands and received lines, if given
+            heartbeat_interval: Seconds between STATUS heartbeats, or None
+                to rely on the transport to report failures
+            
+        Raises:
+            TimeoutError: If the device does not answer within ready_timeout
         """
-        self.ser = serial.Serial(
-            port=port,
-            baudrate=baudrate,
-            timeout=timeout,
-        )
+        if transport is None:
+            if port is None:
+                raise ValueError("Either port or transport is required")
+            transport = SerialTransport(port, baudrate, timeout, vid, pid)
+        self.transport = transport
+        self.recorder = recorder
+        self.timeout = timeout
+        self.ready_timeout = ready_timeout
+        self.heartbeat_interval = heartbeat_interval
+        
+        # Heartbeat state, only touched by the receive thread
+        self._last_rx = time.monotonic()
+        self._next_heartbeat = self._last_rx
+        self._heartbeats_pending = 0
+        self._quiet_status = False
+        
+        # Number of commands dropped because the link was down
+        self.dropped_commands = 0
+        
+        # Guards transport writes and _last_targets between the sender and
+        # the receive/supervisor thread. While the link is down the
+        # supervisor owns the transport and senders don't touch it.
+        self._lock = threading.Lock()
+        self._connected = threading.Event()
+        self._last_targets: dict[tuple[str, int], Command] = {}
+        
+        try:
+            self.transport.open()
+            self._wait_until_ready(ready_timeout)
+        except Exception:
+            # Don't leak the port or socket
+            self.transport.close()
+            raise
+        self._connected.set()
 
         self._running = True
         self._rx_thread = threading.Thread(
@@ -80,33 +204,244 @@ class SerialLink:
         )
         self._rx_thread.start()
 
-        time.sleep(2)
-        logger.info(f"Connected to ESP32 on {port}")
+        logger.info(f"Connected to ESP32 on {self.transport.name}")
+
+    @property
+    def connected(self) -> bool:
+        """Whether the transport is currently open and usable."""
+        return self._connected.is_set()
+
+    def _wait_until_ready(self, timeout: float) -> None:
+        """
+        Poll the device with STATUS until it answers.
+        
+        Args:
+            timeout: Maximum time in seconds to wait
+            
+        Raises:
+            TimeoutError: If no STATUS answer arrives within timeout
+        """
+        start = time.monotonic()
+        deadline = start + timeout
+        self.transport.set_timeout(self.READY_POLL_INTERVAL)
+        try:
+            while True:
+                now = time.monotonic()
+                if now >= deadline:
+                    raise TimeoutError(
+                        f"ESP32 on {self.transport.name} did not answer STATUS "
+                        f"within {timeout:.1f}s"
+                    )
+                probe_end = min(now + self.READY_POLL_INTERVAL, deadline)
+                try:
+                    self.transport.write(StatusCommand().to_message().encode("ascii"))
+                    while time.monotonic() < probe_end:
+                        line = self.transport.readline().decode("ascii", errors="ignore").strip()
+                        if line:
+                            logger.info(f"[ESP32] {line}")
+                        if line == STATUS_HEADER:
+                            elapsed_ms = (time.monotonic() - start) * 1000
+                            logger.debug(f"ESP32 ready after {elapsed_ms:.0f} ms")
+                            return
+                except ConnectionRefusedError:
+                    # Over UDP: nothing listens on the peer's port yet (ICMP
+                    # port unreachable). Not ready; probe again next interval.
+                    time.sleep(max(0.0, probe_end - time.monotonic()))
+        finally:
+            self.transport.set_timeout(self.timeout)
 
     def _read_loop(self) -> None:
         """
-        Continuously read lines from ESP32 and log them.
-        Runs in a separate thread.
+        Continuously read lines from ESP32 and log them, reconnecting
+        whenever the transport fails. Runs in a separate thread.
         """
         while self._running:
+            if not self._connected.is_set():
+                self._reconnect()
+                continue
+            
             try:
-                line = self.ser.readline().decode("ascii", errors="ignore").strip()
-                if line:
+                line = self.transport.readline().decode("ascii", errors="ignore").strip()
+                if line and self.recorder is not None:
+                    self._record_line(self.recorder, line)
+                if line == STATUS_HEADER and self._heartbeats_pending:
+                    # Heartbeat replies are only interesting at DEBUG
+                    self._heartbeats_pending -= 1
+                    self._quiet_status = True
+                if line.startswith("TELEM,") or self._quiet_status:
+                    # Streamed every tick by the SIL plant; too chatty for INFO
+                    logger.debug(f"[ESP32] {line}")
+                elif line:
                     logger.info(f"[ESP32] {line}")
+                if line == STATUS_FOOTER:
+                    self._quiet_status = False
+                
+                if self.heartbeat_interval:
+                    self._heartbeat(bool(line))
             except Exception as e:
-                logger.error(f"Serial read error: {e}")
-                break
+                if self._running:
+                    logger.error(f"Serial read error: {e}")
+                    with self._lock:
+                        self._mark_disconnected()
+
+    def _heartbeat(self, received: bool) -> None:
+        """
+        Send a STATUS heartbeat when due, and drop the link if nothing has
+        been received for HEARTBEAT_MISSES intervals.
+        
+        Args:
+            received: Whether the last read returned a line
+        """
+        interval = self.heartbeat_interval
+        assert interval
+        now = time.monotonic()
+        if received:
+            self._last_rx = now
+        elif now - self._last_rx > interval * self.HEARTBEAT_MISSES:
+            logger.warning(
+                f"No reply from {self.transport.name} for {now - self._last_rx:.1f}s"
+            )
+            with self._lock:
+                self._mark_disconnected()
+            return
+        
+        if now >= self._next_heartbeat:
+            self._next_heartbeat = now + interval
+            with self._lock:
+                if self._connected.is_set():
+                    self.transport.write(StatusCommand().to_message().encode("ascii"))
+                    self._heartbeats_pending += 1
+
+    def _record_line(self, recorder: TelemetrySink, line: str) -> None:
+        """
+        Record a received line. TELEM key/value lines become numeric
+        samples; anything else (acks, errors, status) is kept as text.
+        
+        Args:
+            recorder: Telemetry sink to record to
+            line: Received line without the line ending
+        """
+        if not line.startswith("TELEM,"):
+            recorder.record_text("rx", line)
+            return
+        
+        fields = line.split(",")[1:]
+        samples = []
+        for key, value in zip(fields[0::2], fields[1::2]):
+            try:
+                # "time" is the plant's own clock, not the record timestamp
+                samples.append(("plant_time" if key == "time" else key, float(value)))
+            except ValueError:
+                continue
+        recorder.record_many(samples)
+
+    def _mark_disconnected(self) -> None:
+        """
+        Flag the link as down and release the transport. Must hold self._lock.
+        """
+        if not self._connected.is_set():
+            return
+        self._connected.clear()
+        logger.warning(f"Lost connection to ESP32 on {self.transport.name}, reconnecting")
+        try:
+            self.transport.close()
+        except Exception:
+            pass
+
+    def _reconnect(self) -> None:
+        """
+        Reopen the transport with exponential backoff until the device
+        answers, then resend the last command for every target.
+        """
+        backoff = self.RECONNECT_BACKOFF_MIN
+        started = time.monotonic()
+        while self._running:
+            try:
+                self.transport.open()
+                self._wait_until_ready(self.ready_timeout)
+            except OSError as e:
+                self.transport.close()
+                logger.debug(f"Reconnect attempt failed: {e}")
+                time.sleep(backoff)
+                backoff = min(backoff * 2, self.RECONNECT_BACKOFF_MAX)
+                continue
+            
+            with self._lock:
+                if not self._running:
+                    self.transport.close()
+                    return
+                resync = "".join(
+                    command.to_message() for command in self._last_targets.values()
+                )
+                if resync:
+                    self.transport.write(resync.encode("ascii"))
+                self._last_rx = self._next_heartbeat = time.monotonic()
+                self._heartbeats_pending = 0
+                self._quiet_status = False
+                self._connected.set()
+            
+            elapsed_ms = (time.monotonic() - started) * 1000
+            logger.info(
+                f"Reconnected to ESP32 on {self.transport.name} after {elapsed_ms:.0f} ms, "
+                f"resent {len(self._last_targets)} targets"
+            )
+            return
     
-    def send_command(self, command: Command) -> None:
+    def send_command(self, command: Command) -> bool:
         """
-        Send a command over serial.
+        Send a command over the link.
+        
+        If the link is down the command is dropped; the latest command per
+        target is kept and resent once the link is re-established.
         
         Args:
             command: Command object to send
+            
+        Returns:
+            True if the command was written, False if it was dropped
+        """
+        return self.send_commands([command])
+    
+    def send_commands(self, commands: Sequence[Command]) -> bool:
+        """
+        Send several commands in a single write (one datagram over UDP).
+        
+        Args:
+            commands: Command objects to send
+            
+        Returns:
+            True if the commands were written, False if they were dropped
         """
-        message = command.to_message()
-        self.ser.write(message.encode("ascii"))
+        if not commands:
+            return True
+        message = "".join(command.to_message() for command in commands)
+        
+        with self._lock:
+            for command in commands:
+                key = command.target_key()
+                if key is not None:
+                    self._last_targets[key] = command
+            
+            if not self._connected.is_set():
+                self.dropped_commands += len(commands)
+                return False
+            
+            try:
+                self.transport.write(message.encode("ascii"))
+            except OSError as e:
+                logger.error(f"Serial write error: {e}")
+                self._mark_disconnected()
+                self.dropped_commands += len(commands)
+                return False
+        
+        if self.recorder is not None:
+            timestamp = time.time()
+            self.recorder.record_text("tx", message.rstrip("\n"), timestamp)
+            for command in commands:
+                self.recorder.record_many(command.telemetry(), timestamp)
+        
         logger.debug(f"Sent: {message.strip()}")
+        return True
 
     def send_servo_angle(self, servo_id: int, angle: int, move_time_ms: int = 50) -> None:
         """
@@ -134,7 +469,11 @@ class SerialLink:
     def close(self) -> None:
         """Close the serial connection and stop the read thread."""
         self._running = False
-        if self.ser.is_open:
-            self.ser.close()
+        with self._lock:
+            self._connected.clear()
+            self.transport.close()
+        stats = getattr(self.transport, "stats", None)
+        if stats is not None:
+            logger.info(f"Link stats: {stats}")
         logger.info("Serial connection closed")
 
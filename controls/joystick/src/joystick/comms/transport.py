@@ -0,0 +1,322 @@
+import logging
+import socket
+from abc import ABC, abstractmethod
+from collections import deque
+from dataclasses import dataclass
+
+import serial
+from serial.tools import list_ports
+
+
+logger = logging.getLogger(__name__)
+
+
+class Transport(ABC):
+    """
+    Line-oriented link to the actuator controller.
+
+    Implementations raise OSError (serial.SerialException is one) when the
+    link fails; SerialLink then closes and reopens the transport.
+    """
+
+    @property
+    @abstractmethod
+    def name(self) -> str:
+        """Human-readable description of the endpoint, for logging."""
+        pass
+
+    @abstractmethod
+    def open(self) -> None:
+        """Open (or reopen) the link."""
+        pass
+
+    @abstractmethod
+    def close(self) -> None:
+        """Close the link. Safe to call when already closed."""
+        pass
+
+    @abstractmethod
+    def write(self, data: bytes) -> None:
+        """Send one or more newline-terminated messages."""
+        pass
+
+    @abstractmethod
+    def readline(self) -> bytes:
+        """Return the next received line, or b"" if the read timed out."""
+        pass
+
+    @abstractmethod
+    def set_timeout(self, timeout: float) -> None:
+        """Change the read timeout in seconds."""
+        pass
+
+
+class SerialTransport(Transport):
+    """
+    Transport over a USB serial port.
+
+    The port may also be a pyserial URL, e.g. "socket://192.168.2.2:5005"
+    for the Pi actuator runtime's TCP listener.
+    """
+
+    def __init__(
+        self,
+        port: str,
+        baudrate: int = 115200,
+        timeout: float = 0.1,
+        vid: int | None = None,
+        pid: int | None = None,
+    ):
+        """
+        Configure a serial transport. Call open() to connect.
+
+        Args:
+            port: Serial port path (e.g., "/dev/ttyUSB0") or pyserial URL
+                (e.g., "socket://192.168.2.2:5005")
+            baudrate: Communication baud rate
+            timeout: Read timeout in seconds
+            vid: USB vendor ID of the serial adapter. If set together with
+                pid, the port is located by VID/PID instead of by path.
+            pid: USB product ID of the serial adapter
+        """
+        self.port = port
+        self.baudrate = baudrate
+        self.timeout = timeout
+        self.vid = vid
+        self.pid = pid
+        self.ser: serial.Serial | None = None
+
+    @property
+    def name(self) -> str:
+        return self.port
+
+    def _find_port(self) -> str:
+        """
+        Resolve the serial port path, searching by VID/PID if configured.
+
+        Returns:
+            Serial port path
+
+        Raises:
+            serial.SerialException: If no device matches the VID/PID
+        """
+        if self.vid is None or self.pid is None:
+            return self.port
+
+        for info in list_ports.comports():
+            if info.vid == self.vid and info.pid == self.pid:
+                device: str = info.device
+                return device
+        raise serial.SerialException(
+            f"No serial device with VID:PID {self.vid:04X}:{self.pid:04X}"
+        )
+
+    def open(self) -> None:
+        """Open the serial port without resetting the ESP32."""
+        self.port = self._find_port()
+
+        # serial_for_url also accepts plain device paths
+        ser = serial.serial_for_url(self.port, do_not_open=True)
+        ser.baudrate = self.baudrate
+        ser.timeout = self.timeout
+        # Keep DTR/RTS deasserted so opening the port does not trigger the
+        # board's auto-reset circuit; a running ESP32 answers immediately.
+        ser.dtr = False
+        ser.rts = False
+        ser.open()
+        self.ser = ser
+
+    def close(self) -> None:
+        if self.ser is not None and self.ser.is_open:
+            self.ser.close()
+
+    def _open_port(self) -> serial.Serial:
+        """The open port; raises serial.SerialException if not opened yet."""
+        if self.ser is None:
+            raise serial.SerialException(f"{self.port} is not open")
+        return self.ser
+
+    def write(self, data: bytes) -> None:
+        self._open_port().write(data)
+
+    def readline(self) -> bytes:
+        line: bytes = self._open_port().readline()
+        return line
+
+    def set_timeout(self, timeout: float) -> None:
+        self._open_port().timeout = timeout
+
+
+@dataclass
+class LinkStats:
+    """Datagram counters for a UDP link."""
+    sent: int = 0
+    received: int = 0
+    lost: int = 0
+    reordered: int = 0
+    duplicates: int = 0
+
+
+class SequenceTracker:
+    """
+    Latest-wins filter for sequence-numbered datagrams.
+
+    Datagrams newer than any seen so far are accepted. Older ones are
+    rejected and counted as reordered (first arrival of a sequence
+    number previously counted lost) or duplicates (redundant copies).
+
+    The Pi runtime has its own copy in rasberry_pi/src/comms/udp_server.py,
+    since the two are deployed separately. Keep accept() in sync with it.
+    """
+
+    # Number of recent sequence numbers remembered to tell the two apart
+    WINDOW = 64
+    # A backwards jump this large means the sender restarted
+    RESTART_GAP = 1024
+
+    def __init__(self, stats: LinkStats):
+        self.stats = stats
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget the stream position, e.g. after reconnecting."""
+        self.highest: int | None = None
+        # Bit i is set if sequence (highest - i) has been received
+        self._seen = 0
+
+    def accept(self, seq: int) -> bool:
+        """
+        Record a received sequence number.
+
+        Args:
+            seq: Sequence number of the datagram
+
+        Returns:
+            True if the datagram is the newest so far and should be used
+        """
+        if self.highest is not None and (
+            seq == 1 and self.highest > 1
+            or self.highest - seq > self.RESTART_GAP
+        ):
+            logger.info("Peer restarted its sequence, resynchronizing")
+            self.reset()
+
+        if self.highest is None or seq > self.highest:
+            if self.highest is not None:
+                gap = seq - self.highest
+                self.stats.lost += gap - 1
+                self._seen = (self._seen << gap) & ((1 << self.WINDOW) - 1)
+            self._seen |= 1
+            self.highest = seq
+            self.stats.received += 1
+            return True
+
+        offset = self.highest - seq
+        if offset < self.WINDOW and self._seen & (1 << offset):
+            self.stats.duplicates += 1
+        else:
+            if offset < self.WINDOW:
+                self._seen |= 1 << offset
+                self.stats.lost -= 1
+            self.stats.reordered += 1
+        return False
+
+
+class UdpTransport(Transport):
+    """
+    Transport over UDP, for use on the tether Ethernet.
+
+    Every write() becomes one datagram whose first line is "#<seq>". The
+    receiver keeps only datagrams newer than the last one it used, so
+    stale state never overwrites fresh state. Each datagram can be sent
+    several times (redundancy) to ride out single-packet loss.
+    """
+
+    MAX_DATAGRAM = 65507
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        timeout: float = 0.1,
+        redundancy: int = 1,
+    ):
+        """
+        Configure a UDP transport. Call open() to connect.
+
+        Args:
+            host: Address of the actuator runtime
+            port: UDP port of the actuator runtime
+            timeout: Read timeout in seconds
+            redundancy: Number of copies of each datagram to send
+        """
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.redundancy = max(1, redundancy)
+        self.sock: socket.socket | None = None
+
+        self.stats = LinkStats()
+        self._tx_seq = 0
+        self._rx = SequenceTracker(self.stats)
+        self._lines: deque[bytes] = deque()
+
+    @property
+    def name(self) -> str:
+        return f"udp://{self.host}:{self.port}"
+
+    def open(self) -> None:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        try:
+            sock.connect((self.host, self.port))
+        except OSError:
+            sock.close()
+            raise
+        sock.settimeout(self.timeout)
+        self.sock = sock
+        self._rx.reset()
+        self._lines.clear()
+
+    def close(self) -> None:
+        if self.sock is not None:
+            self.sock.close()
+            self.sock = None
+
+    def _open_socket(self) -> socket.socket:
+        """The connected socket; raises OSError if not opened yet."""
+        if self.sock is None:
+            raise OSError(f"{self.name} is not open")
+        return self.sock
+
+    def write(self, data: bytes) -> None:
+        sock = self._open_socket()
+        self._tx_seq += 1
+        datagram = f"#{self._tx_seq}\n".encode("ascii") + data
+        for _ in range(self.redundancy):
+            sock.send(datagram)
+        self.stats.sent += 1
+
+    def readline(self) -> bytes:
+        if self._lines:
+            return self._lines.popleft()
+
+        try:
+            datagram = self._open_socket().recv(self.MAX_DATAGRAM)
+        except socket.timeout:
+            return b""
+
+        lines = datagram.splitlines(keepends=True)
+        if lines and lines[0].startswith(b"#"):
+            try:
+                seq = int(lines[0][1:])
+            except ValueError:
+                return b""
+            if not self._rx.accept(seq):
+                return b""
+            lines = lines[1:]
+
+        self._lines.extend(lines)
+        return self._lines.popleft() if self._lines else b""
+
+    def set_timeout(self, timeout: float) -> None:
+        self._open_socket().settimeout(timeout)
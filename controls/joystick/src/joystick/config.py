@@ -0,0 +1,369 @@
+"""Configuration loading, validation and hot reloading."""
+import hashlib
+import logging
+import threading
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import yaml
+
+from joystick.mapping import AxisConfig, AxisMapper
+
+
+logger = logging.getLogger(__name__)
+
+
+# Sections that are only read at startup; changing them needs a restart
+RESTART_SECTIONS = ("joystick", "inputs", "pipeline", "telemetry")
+RESTART_SERIAL_KEYS = (
+    "port", "baudrate", "timeout", "ready_timeout", "vid", "pid",
+    "transport", "udp", "full_state",
+)
+
+# Accepted values of pipeline.mode
+PIPELINE_MODES = ("single", "multiprocess")
+
+# Parsed configurations keyed by the SHA-1 of the file contents
+_parse_cache: dict[str, dict[str, Any]] = {}
+_PARSE_CACHE_SIZE = 8
+
+
+def parse_config(text: bytes) -> dict[str, Any]:
+    """
+    Parse YAML configuration text, reusing earlier results for identical input.
+
+    The returned dictionary is shared with the cache and must not be modified.
+
+    Args:
+        text: Raw contents of the configuration file
+
+    Returns:
+        Configuration dictionary
+    """
+    digest = hashlib.sha1(text).hexdigest()
+    config = _parse_cache.get(digest)
+    if config is None:
+        config = yaml.safe_load(text) or {}
+        if len(_parse_cache) >= _PARSE_CACHE_SIZE:
+            _parse_cache.pop(next(iter(_parse_cache)))
+        _parse_cache[digest] = config
+    return config
+
+
+def load_config(config_path: str | Path) -> dict[str, Any]:
+    """
+    Load and validate configuration from a YAML file.
+
+    Args:
+        config_path: Path to the YAML configuration file
+
+    Returns:
+        Configuration dictionary
+
+    Raises:
+        ValueError: If the configuration is invalid
+    """
+    config = parse_config(Path(config_path).read_bytes())
+    validate_config(config)
+    logger.info(f"Loaded configuration from {config_path}")
+    return config
+
+
+def validate_config(config: dict[str, Any]) -> None:
+    """
+    Check that a configuration can be used by the controller.
+
+    Args:
+        config: Configuration dictionary
+
+    Raises:
+        ValueError: If the configuration is invalid
+    """
+    if not isinstance(config, dict):
+        raise ValueError("Configuration must be a mapping")
+
+    inputs_config = config.get("inputs")
+    if inputs_config is None:
+        joystick_config = config.get("joystick")
+        if not isinstance(joystick_config, dict) or "device_index" not in joystick_config:
+            raise ValueError("joystick.device_index is required")
+    else:
+        _validate_inputs(inputs_config)
+
+    serial_config = config.get("serial")
+    if not isinstance(serial_config, dict):
+        raise ValueError("serial section is required")
+    for key in ("port", "baudrate"):
+        if key not in serial_config:
+            raise ValueError(f"serial.{key} is required")
+    if serial_config.get("send_rate_hz", 30) <= 0:
+        raise ValueError("serial.send_rate_hz must be positive")
+    transport = serial_config.get("transport", "serial")
+    if transport not in ("serial", "udp"):
+        raise ValueError(f"Unknown serial.transport: {transport}")
+    if transport == "udp":
+        udp_config = serial_config.get("udp", {})
+        if "host" not in udp_config:
+            raise ValueError("serial.udp.host is required for the udp transport")
+        # A reordered datagram is dropped as stale; only a full-state
+        # stream resends what it carried on the next tick
+        if not serial_config.get("full_state", False):
+            raise ValueError("serial.full_state must be true for the udp transport")
+        if udp_config.get("heartbeat_interval", 1.0) < 0:
+            raise ValueError("serial.udp.heartbeat_interval must not be negative")
+
+    telemetry_config = config.get("telemetry", {})
+    if not isinstance(telemetry_config, dict):
+        raise ValueError("telemetry must be a mapping")
+    if telemetry_config.get("chunk_size", 4096) <= 0:
+        raise ValueError("telemetry.chunk_size must be positive")
+    if telemetry_config.get("flush_interval", 5.0) <= 0:
+        raise ValueError("telemetry.flush_interval must be positive")
+    publish_config = telemetry_config.get("publish", {})
+    if not isinstance(publish_config, dict):
+        raise ValueError("telemetry.publish must be a mapping")
+    if not 0 < publish_config.get("port", 5010) < 65536:
+        raise ValueError("telemetry.publish.port must be a valid UDP port")
+
+    pipeline_config = config.get("pipeline", {})
+    if not isinstance(pipeline_config, dict):
+        raise ValueError("pipeline must be a mapping")
+    mode = pipeline_config.get("mode", "single")
+    if mode not in PIPELINE_MODES:
+        raise ValueError(
+            f"Unknown pipeline.mode: {mode} (expected one of {', '.join(PIPELINE_MODES)})"
+        )
+    if pipeline_config.get("input_rate_hz", 250) <= 0:
+        raise ValueError("pipeline.input_rate_hz must be positive")
+
+    axes = config.get("axes", [])
+    if not isinstance(axes, list):
+        raise ValueError("axes must be a list")
+
+    names = set()
+    for axis_data in axes:
+        try:
+            axis = AxisConfig.from_dict(axis_data)
+        except (KeyError, TypeError) as e:
+            raise ValueError(f"Invalid axis entry {axis_data!r}: missing {e}") from e
+
+        if axis.name in names:
+            raise ValueError(f"Duplicate axis name: {axis.name}")
+        names.add(axis.name)
+
+        if axis.axis_index < 0:
+            raise ValueError(f"{axis.name}: axis_index must be >= 0")
+        if not 0.0 <= axis.deadzone < 1.0:
+            raise ValueError(f"{axis.name}: deadzone must be in [0, 1)")
+        if axis.epsilon < 0:
+            raise ValueError(f"{axis.name}: epsilon must be >= 0")
+        if axis.move_time_ms < 0:
+            raise ValueError(f"{axis.name}: move_time_ms must be >= 0")
+
+
+def _validate_inputs(inputs_config: Any) -> None:
+    """
+    Check the "inputs" section used to build an InputHub.
+
+    Args:
+        inputs_config: Inputs configuration section
+
+    Raises:
+        ValueError: If the section is invalid
+    """
+    if not isinstance(inputs_config, dict) or not inputs_config.get("sources"):
+        raise ValueError("inputs.sources must list at least one source")
+
+    source_names = set()
+    for source in inputs_config["sources"]:
+        if "name" not in source or "device_index" not in source:
+            raise ValueError(f"Input source {source!r} needs a name and device_index")
+        if source["name"] in source_names:
+            raise ValueError(f"Duplicate input source name: {source['name']}")
+        source_names.add(source["name"])
+
+    for route in inputs_config.get("routes", []):
+        if "axis_index" not in route or not route.get("sources"):
+            raise ValueError(f"Input route {route!r} needs an axis_index and sources")
+        for candidate in route["sources"]:
+            if candidate.get("source") not in source_names:
+                raise ValueError(f"Input route refers to unknown source: {candidate.get('source')}")
+            if "axis_index" not in candidate:
+                raise ValueError(f"Input route candidate {candidate!r} needs an axis_index")
+
+
+def build_loop_settings(config: dict[str, Any]) -> tuple[AxisMapper, float]:
+    """
+    Build the hot-reloadable parts of the control loop from a configuration.
+
+    Args:
+        config: Validated configuration dictionary
+
+    Returns:
+        Tuple of (axis mapper, send rate in Hz)
+    """
+    axis_configs = [
+        AxisConfig.from_dict(axis_data)
+        for axis_data in config.get("axes", [])
+    ]
+    send_rate_hz = config["serial"].get("send_rate_hz", 30)
+    return AxisMapper(axis_configs), send_rate_hz
+
+
+def restart_required(old: dict[str, Any], new: dict[str, Any]) -> list[str]:
+    """
+    List settings that differ between two configurations but cannot be
+    applied without restarting the controller.
+
+    Args:
+        old: Configuration currently in use
+        new: Newly loaded configuration
+
+    Returns:
+        Dotted names of the changed startup-only settings
+    """
+    changed = [
+        section for section in RESTART_SECTIONS
+        if old.get(section) != new.get(section)
+    ]
+    old_serial = old.get("serial", {})
+    new_serial = new.get("serial", {})
+    changed.extend(
+        f"serial.{key}" for key in RESTART_SERIAL_KEYS
+        if old_serial.get(key) != new_serial.get(key)
+    )
+    return changed
+
+
+class LoopSettings:
+    """
+    Hot-reloadable control loop settings: axis mapper and send rate.
+
+    The config watcher thread stages a new mapper/rate pair with stage()
+    and the control loop adopts it between ticks with apply(), so a tick
+    never sees a half-applied config.
+    """
+
+    def __init__(self, config: dict[str, Any]):
+        """
+        Args:
+            config: Validated configuration dictionary
+        """
+        self.config = config
+        self.axis_mapper, self.send_rate_hz = build_loop_settings(config)
+        self._staged = (config, self.axis_mapper, self.send_rate_hz)
+
+    @property
+    def period(self) -> float:
+        """Seconds between ticks."""
+        return 1.0 / self.send_rate_hz
+
+    def stage(self, config: dict[str, Any]) -> None:
+        """
+        Stage a reloaded configuration to be applied on the next tick.
+        Called from the config watcher thread.
+
+        Args:
+            config: Validated configuration dictionary
+        """
+        changed = restart_required(self.config, config)
+        if changed:
+            logger.warning(
+                f"Restart required to apply changes to: {', '.join(changed)}"
+            )
+        axis_mapper, send_rate_hz = build_loop_settings(config)
+        # Single assignment so the control loop never sees a partial update
+        self._staged = (config, axis_mapper, send_rate_hz)
+
+    def apply(self) -> bool:
+        """
+        Adopt a staged configuration, if any. Called between ticks.
+
+        Returns:
+            True if a new configuration was adopted
+        """
+        config, axis_mapper, send_rate_hz = self._staged
+        if config is self.config:
+            return False
+
+        self.axis_mapper = axis_mapper
+        self.send_rate_hz = send_rate_hz
+        self.config = config
+        logger.info(
+            f"Configuration reloaded: {len(axis_mapper.configs)} axes, "
+            f"{send_rate_hz} Hz"
+        )
+        return True
+
+
+class ConfigWatcher:
+    """
+    Watches a configuration file and reports valid new versions.
+
+    The file is polled from a background thread; only the modification
+    time and size are checked until they change, so polling is cheap.
+    Invalid files are logged and ignored, keeping the last good config.
+    """
+
+    def __init__(
+        self,
+        config_path: str | Path,
+        on_reload: Callable[[dict[str, Any]], None],
+        poll_interval: float = 0.5,
+    ):
+        """
+        Initialize the watcher. Call start() to begin polling.
+
+        Args:
+            config_path: Path to the YAML configuration file
+            on_reload: Called from the watcher thread with each new valid config
+            poll_interval: Seconds between file checks
+        """
+        self.config_path = Path(config_path)
+        self.on_reload = on_reload
+        self.poll_interval = poll_interval
+
+        self._signature = self._stat()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._watch_loop, daemon=True)
+
+    def _stat(self) -> tuple[int, int] | None:
+        """Return (mtime_ns, size) of the file, or None if it is missing."""
+        try:
+            stat = self.config_path.stat()
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def start(self) -> None:
+        """Start polling the configuration file."""
+        self._thread.start()
+        logger.info(f"Watching {self.config_path} for changes")
+
+    def stop(self) -> None:
+        """Stop polling the configuration file."""
+        self._stop.set()
+
+    def check(self) -> None:
+        """Reload the configuration if the file changed since the last check."""
+        signature = self._stat()
+        if signature is None or signature == self._signature:
+            return
+        self._signature = signature
+
+        try:
+            config = load_config(self.config_path)
+        except (OSError, yaml.YAMLError, ValueError) as e:
+            logger.error(f"Ignoring invalid configuration: {e}")
+            return
+
+        self.on_reload(config)
+
+    def _watch_loop(self) -> None:
+        """Poll the file until stopped. Runs in a separate thread."""
+        while not self._stop.wait(self.poll_interval):
+            try:
+                self.check()
+            except Exception as e:
+                logger.error(f"Configuration reload failed: {e}")
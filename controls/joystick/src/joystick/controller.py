@@ -1,19 +1,114 @@
 """Controller module for managing joystick input and serial output."""
 import logging
 import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 from pathlib import Path
 from typing import Any
 
-import yaml
-
+from joystick.config import ConfigWatcher, LoopSettings, load_config
+from joystick.hub import InputHub
 from joystick.reader import JoystickReader
-from joystick.mapping import AxisConfig, AxisMapper
 from joystick.comms.serial_link import SerialLink, ServoCommand
+from joystick.comms.transport import Transport, UdpTransport
+from joystick.telemetry.sinks import TelemetryFanout, TelemetryPublisher, TelemetrySink
+from joystick.telemetry.store import TelemetryRecorder
 
 
 logger = logging.getLogger(__name__)
 
 
+def create_reader(config: dict[str, Any]) -> JoystickReader | InputHub:
+    """
+    Open the input device(s) described by a configuration.
+    
+    Args:
+        config: Validated configuration dictionary
+        
+    Returns:
+        InputHub if an "inputs" section is present, otherwise a JoystickReader
+    """
+    if "inputs" in config:
+        return InputHub.from_config(config["inputs"])
+    return JoystickReader(config["joystick"]["device_index"])
+
+
+def create_recorder(config: dict[str, Any]) -> TelemetrySink | None:
+    """
+    Set up the telemetry destinations enabled in the "telemetry" section.
+    
+    Each run records into a new timestamped directory under telemetry.path,
+    and telemetry.publish streams the same samples to a live viewer.
+    
+    Args:
+        config: Validated configuration dictionary
+        
+    Returns:
+        TelemetryRecorder, TelemetryPublisher, a TelemetryFanout of both,
+        or None if neither is enabled
+    """
+    telemetry_config = config.get("telemetry", {})
+    sinks: list[TelemetrySink] = []
+    if telemetry_config.get("enabled", False):
+        path = Path(telemetry_config.get("path", "recordings"))
+        sinks.append(TelemetryRecorder(
+            path / datetime.now().strftime("%Y%m%d-%H%M%S"),
+            chunk_size=telemetry_config.get("chunk_size", 4096),
+            flush_interval=telemetry_config.get("flush_interval", 5.0),
+        ))
+    
+    publish_config = telemetry_config.get("publish", {})
+    if publish_config.get("enabled", False):
+        sinks.append(TelemetryPublisher(
+            host=publish_config.get("host", "127.0.0.1"),
+            port=publish_config.get("port", 5010),
+        ))
+    
+    if not sinks:
+        return None
+    return sinks[0] if len(sinks) == 1 else TelemetryFanout(sinks)
+
+
+def create_serial_link(
+    serial_config: dict[str, Any],
+    recorder: TelemetrySink | None = None,
+) -> SerialLink:
+    """
+    Open the link described by the "serial" configuration section.
+    
+    Args:
+        serial_config: Serial configuration dictionary
+        recorder: Telemetry sink for commands and replies
+        
+    Returns:
+        Connected SerialLink
+    """
+    transport: Transport | None = None
+    heartbeat_interval = None
+    if serial_config.get("transport", "serial") == "udp":
+        udp_config = serial_config["udp"]
+        transport = UdpTransport(
+            host=udp_config["host"],
+            port=udp_config.get("port", 5005),
+            timeout=serial_config.get("timeout", 0.1),
+            redundancy=udp_config.get("redundancy", 1),
+        )
+        # UDP has no failure of its own to report; probe the peer instead
+        heartbeat_interval = udp_config.get("heartbeat_interval", 1.0) or None
+    
+    return SerialLink(
+        port=serial_config["port"],
+        baudrate=serial_config["baudrate"],
+        timeout=serial_config.get("timeout", 0.1),
+        ready_timeout=serial_config.get("ready_timeout", 5.0),
+        vid=serial_config.get("vid"),
+        pid=serial_config.get("pid"),
+        transport=transport,
+        recorder=recorder,
+        heartbeat_interval=heartbeat_interval,
+    )
+
+
 class JoystickController:
     """Main controller that coordinates joystick reading and serial communication."""
     
@@ -24,48 +119,60 @@ class JoystickController:
         Args:
             config_path: Path to the YAML configuration file
         """
-        self.config = self._load_config(config_path)
+        self.config = load_config(config_path)
+        serial_config = self.config["serial"]
+        self.recorder = create_recorder(self.config)
         
-        # Initialize joystick reader
-        joystick_index = self.config["joystick"]["device_index"]
-        self.reader = JoystickReader(joystick_index)
+        # Bring up the serial link in the background while the joystick is
+        # initialized on this thread (SDL expects to stay on the main thread)
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            serial_future = executor.submit(
+                create_serial_link, serial_config, self.recorder
+            )
+            
+            try:
+                self.reader = create_reader(self.config)
+            except Exception:
+                # Don't leave the serial port open if the joystick is missing
+                try:
+                    serial_future.result().close()
+                except Exception:
+                    pass
+                if self.recorder is not None:
+                    self.recorder.close()
+                raise
+            
+            try:
+                self.serial_link = serial_future.result()
+            except Exception:
+                # Most often the ESP32 is not plugged in and the STATUS
+                # handshake timed out
+                self.reader.close()
+                if self.recorder is not None:
+                    self.recorder.close()
+                raise
         
-        # Initialize serial communication
-        serial_config = self.config["serial"]
-        self.serial_link = SerialLink(
-            port=serial_config["port"],
-            baudrate=serial_config["baudrate"],
-            timeout=serial_config.get("timeout", 0.1),
-        )
+        # Axis mapping and loop rate can be swapped at runtime
+        self.settings = LoopSettings(self.config)
         
-        # Initialize axis mapper
-        axis_configs = [
-            AxisConfig.from_dict(axis_data)
-            for axis_data in self.config.get("axes", [])
-        ]
-        self.axis_mapper = AxisMapper(axis_configs)
+        # Send every axis every tick instead of only changes; doubles as
+        # a keepalive for the actuator watchdog
+        self.full_state = serial_config.get("full_state", False)
         
-        # Control loop settings
-        self.send_rate_hz = serial_config.get("send_rate_hz", 30)
-        self.period = 1.0 / self.send_rate_hz
+        # Channel names for recorded input axes, built once
+        self._axis_channels: list[str] = []
         
-        logger.info(f"Controller initialized with {len(axis_configs)} axes")
-        logger.info(f"Update rate: {self.send_rate_hz} Hz")
-    
-    def _load_config(self, config_path: str | Path) -> dict[str, Any]:
-        """
-        Load configuration from YAML file.
+        self.config_watcher: ConfigWatcher | None = None
+        reload_config = self.config.get("reload", {})
+        if reload_config.get("enabled", True):
+            self.config_watcher = ConfigWatcher(
+                config_path,
+                self.settings.stage,
+                poll_interval=reload_config.get("poll_interval", 0.5),
+            )
         
-        Args:
-            config_path: Path to the YAML configuration file
-            
-        Returns:
-            Configuration dictionary
-        """
-        with open(config_path, "r") as f:
-            config = yaml.safe_load(f)
-        logger.info(f"Loaded configuration from {config_path}")
-        return config
+        logger.info(f"Controller initialized with {len(self.settings.axis_mapper.configs)} axes")
+        logger.info(f"Update rate: {self.settings.send_rate_hz} Hz")
     
     def run(self) -> None:
         """
@@ -76,52 +183,103 @@ class JoystickController:
         """
         logger.info("Starting control loop. Press Ctrl+C to exit.")
         
+        if self.config_watcher is not None:
+            self.config_watcher.start()
+        
         try:
             while True:
-                # Read joystick state
-                state = self.reader.read()
-                
-                # Process all configured axes
-                mapped_values = self.axis_mapper.process_axes(state.axes)
-                
-                # Send updates for axes that have changed enough
-                for axis_name, value in mapped_values.items():
-                    if self.axis_mapper.should_send(axis_name, value):
-                        self._send_axis_command(axis_name, value)
-                
-                time.sleep(self.period)
+                self.tick()
+                time.sleep(self.settings.period)
                 
         except KeyboardInterrupt:
             logger.info("Control loop interrupted")
         finally:
             self.cleanup()
     
-    def _send_axis_command(self, axis_name: str, value: float) -> None:
+    def tick(self) -> None:
+        """Run one iteration of the control loop: read, map and send."""
+        self.settings.apply()
+        axis_mapper = self.settings.axis_mapper
+        
+        # Read joystick state
+        state = self.reader.read()
+        if self.recorder is not None:
+            self._record_input(self.recorder, state.axes)
+        
+        # Process all configured axes
+        mapped_values = axis_mapper.process_axes(state.axes)
+        
+        if self.full_state:
+            # Send every axis every tick in one write
+            commands = [
+                self._axis_command(axis_name, value)
+                for axis_name, value in mapped_values.items()
+            ]
+            self.serial_link.send_commands(
+                [command for command in commands if command is not None]
+            )
+        else:
+            # Send updates for axes that have changed enough
+            for axis_name, value in mapped_values.items():
+                if axis_mapper.should_send(axis_name, value):
+                    self._send_axis_command(axis_name, value)
+    
+    def _record_input(self, recorder: TelemetrySink, axes: list[float]) -> None:
         """
-        Send a command for a specific axis.
+        Record raw input axes as input_axis_<index> channels.
+        
+        Args:
+            recorder: Telemetry sink to record to
+            axes: Raw axis values of this tick
+        """
+        if len(self._axis_channels) < len(axes):
+            self._axis_channels = [f"input_axis_{i}" for i in range(len(axes))]
+        recorder.record_many(zip(self._axis_channels, axes))
+    
+    def _axis_command(self, axis_name: str, value: float) -> ServoCommand | None:
+        """
+        Build the command for a specific axis.
         
         Args:
             axis_name: Name of the axis
             value: Mapped value to send
+            
+        Returns:
+            ServoCommand, or None if the axis is not configured
         """
-        config = self.axis_mapper.get_config(axis_name)
+        config = self.settings.axis_mapper.get_config(axis_name)
         if config is None:
             logger.warning(f"No configuration found for axis: {axis_name}")
-            return
+            return None
         
-        value_int = int(round(value))
-        
-        command = ServoCommand(
+        return ServoCommand(
             servo_id=config.target_servo_id,
-            angle=value_int,
+            angle=int(round(value)),
             move_time_ms=config.move_time_ms,
         )
+    
+    def _send_axis_command(self, axis_name: str, value: float) -> None:
+        """
+        Send a command for a specific axis.
+        
+        Args:
+            axis_name: Name of the axis
+            value: Mapped value to send
+        """
+        command = self._axis_command(axis_name, value)
+        if command is None:
+            return
         
         self.serial_link.send_command(command)
-        logger.debug(f"{axis_name}: {value_int}")
+        logger.debug(f"{axis_name}: {command.angle}")
     
     def cleanup(self) -> None:
         """Clean up resources when shutting down."""
         logger.info("Cleaning up...")
+        if self.config_watcher is not None:
+            self.config_watcher.stop()
+        self.reader.close()
         self.serial_link.close()
+        if self.recorder is not None:
+            self.recorder.close()
         logger.info("Shutdown complete")
@@ -0,0 +1,327 @@
+"""Input hub that merges several input sources into one joystick state."""
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Protocol
+
+from joystick.reader import JoystickReader, JoystickState
+
+
+logger = logging.getLogger(__name__)
+
+
+class InputSource(Protocol):
+    """Anything that can be polled for a JoystickState."""
+
+    def read(self) -> JoystickState:
+        """Return the current state of the source."""
+        ...
+
+    def close(self) -> None:
+        """Release the underlying device."""
+        ...
+
+
+@dataclass
+class SourceAxis:
+    """One candidate input for a merged axis."""
+    source: str
+    axis_index: int
+    override_threshold: float = 0.0
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "SourceAxis":
+        """Create a SourceAxis from a dictionary (e.g., from YAML)."""
+        return cls(
+            source=data["source"],
+            axis_index=data["axis_index"],
+            override_threshold=data.get("override_threshold", 0.0),
+        )
+
+
+@dataclass
+class AxisRoute:
+    """
+    Routing rule for one axis of the merged state.
+
+    Candidates are listed from highest to lowest priority. The first
+    candidate whose source is connected, has a fresh sample and reads at
+    least its override_threshold (in absolute value) provides the axis.
+    """
+    axis_index: int
+    candidates: list[SourceAxis]
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "AxisRoute":
+        """Create an AxisRoute from a dictionary (e.g., from YAML)."""
+        return cls(
+            axis_index=data["axis_index"],
+            candidates=[SourceAxis.from_dict(c) for c in data["sources"]],
+        )
+
+
+class SourceSampler:
+    """
+    Polls one input source on its own thread and keeps the latest sample.
+
+    Meant for sources whose read() can block (e.g. network inputs).
+    JoystickReader sources are read directly by InputHub instead.
+    """
+
+    def __init__(self, name: str, source: InputSource, rate_hz: float = 250):
+        """
+        Initialize the sampler. Call start() to begin polling.
+
+        Args:
+            name: Name of the source
+            source: Source to poll
+            rate_hz: Polling rate in Hz
+        """
+        self.name = name
+        self.source = source
+        self.period = 1.0 / rate_hz
+        self.latest: JoystickState | None = None
+
+        self._running = False
+        self._thread = threading.Thread(target=self._sample_loop, daemon=True)
+
+    def start(self) -> None:
+        """Start polling the source."""
+        self._running = True
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop polling and close the source."""
+        self._running = False
+        if self._thread.is_alive():
+            self._thread.join(timeout=1.0)
+        self.source.close()
+
+    def _sample_loop(self) -> None:
+        """Poll the source until stopped. Runs in a separate thread."""
+        next_sample = time.monotonic()
+        while self._running:
+            try:
+                # Replacing the reference is atomic, readers never see a
+                # partially built state
+                self.latest = self.source.read()
+            except Exception as e:
+                logger.error(f"Input source {self.name} read error: {e}")
+
+            next_sample += self.period
+            delay = next_sample - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                next_sample = time.monotonic()
+
+
+class InputHub:
+    """
+    Merges several input sources into one JoystickState.
+
+    JoystickReader sources are read directly in read(): SDL expects its
+    events to be pumped on the main thread, and once read() has pumped
+    them, reading a joystick is only a few cached memory reads. Every
+    other source is sampled on its own thread, so read() only picks up
+    its latest timestamped sample and never waits on it. A slow or
+    unplugged source cannot hold up the others or the send loop; its
+    samples simply go stale and routing falls through to the next
+    candidate.
+    """
+
+    def __init__(
+        self,
+        sources: dict[str, InputSource],
+        routes: list[AxisRoute] | None = None,
+        stale_after: float = 0.25,
+        rate_hz: float = 250,
+    ):
+        """
+        Initialize the hub and start sampling all sources.
+
+        Args:
+            sources: Input sources by name, in order of precedence for
+                buttons and hats
+            routes: Axis routing rules. If omitted, the axes of the first
+                source are passed through unchanged.
+            stale_after: Samples older than this many seconds are ignored
+            rate_hz: Polling rate in Hz of sources sampled on a thread
+        """
+        if not sources:
+            raise ValueError("InputHub needs at least one source")
+
+        self.sources = sources
+        # Sources that may block get a sampler thread; joysticks are read
+        # directly after pumping SDL events
+        self.samplers = {
+            name: SourceSampler(name, source, rate_hz)
+            for name, source in sources.items()
+            if not isinstance(source, JoystickReader)
+        }
+        self._pump = len(self.samplers) < len(sources)
+        self.routes = routes
+        self.stale_after = stale_after
+
+        for route in routes or []:
+            for candidate in route.candidates:
+                if candidate.source not in sources:
+                    raise ValueError(f"Unknown input source: {candidate.source}")
+
+        self.num_axes = (
+            max(route.axis_index for route in routes) + 1 if routes else 0
+        )
+
+        for sampler in self.samplers.values():
+            sampler.start()
+
+        # Give every sampled source a chance to produce a first sample so
+        # the first merged state is complete
+        deadline = time.monotonic() + stale_after
+        while time.monotonic() < deadline and any(
+            sampler.latest is None for sampler in self.samplers.values()
+        ):
+            time.sleep(0.001)
+        logger.info(
+            f"Input hub reading {len(sources)} sources, "
+            f"{len(self.samplers)} of them on sampler threads"
+        )
+
+    @classmethod
+    def from_config(cls, config: dict[str, Any]) -> "InputHub":
+        """
+        Create an InputHub from the "inputs" configuration section.
+
+        Args:
+            config: Inputs configuration dictionary
+
+        Returns:
+            Running InputHub
+
+        Raises:
+            ValueError: If a source type is unknown
+        """
+        sources: dict[str, InputSource] = {}
+        try:
+            for source_data in config["sources"]:
+                source_type = source_data.get("type", "joystick")
+                if source_type != "joystick":
+                    raise ValueError(f"Unknown input source type: {source_type}")
+                sources[source_data["name"]] = JoystickReader(
+                    source_data["device_index"], pump_events=False
+                )
+        except Exception:
+            for source in sources.values():
+                source.close()
+            raise
+
+        routes = None
+        if "routes" in config:
+            routes = [AxisRoute.from_dict(r) for r in config["routes"]]
+
+        return cls(
+            sources,
+            routes=routes,
+            stale_after=config.get("stale_after", 0.25),
+            rate_hz=config.get("rate_hz", 250),
+        )
+
+    def _is_live(self, sample: JoystickState | None, now: float) -> bool:
+        """Whether a sample can be used for routing."""
+        return (
+            sample is not None
+            and sample.connected
+            and now - sample.timestamp <= self.stale_after
+        )
+
+    def read(self) -> JoystickState:
+        """
+        Merge the latest samples of all sources.
+
+        Returns:
+            JoystickState with routed axes, the buttons and hats of all
+            sources concatenated in source order, and the timestamp of the
+            oldest sample that contributed an axis
+        """
+        if self._pump:
+            JoystickReader.pump()
+        samples: dict[str, JoystickState | None] = {}
+        for name, source in self.sources.items():
+            sampler = self.samplers.get(name)
+            samples[name] = source.read() if sampler is None else sampler.latest
+        now = time.monotonic()
+
+        buttons: list[int] = []
+        hats: list[tuple[int, int]] = []
+        for sample in samples.values():
+            if sample is not None:
+                buttons.extend(sample.buttons)
+                hats.extend(sample.hats)
+
+        if self.routes is None:
+            primary = next(iter(samples.values()))
+            if primary is None:
+                return JoystickState(axes=[], buttons=buttons, hats=hats, connected=False)
+            if not self._is_live(primary, now):
+                # Center the axes rather than replaying a stale position
+                return JoystickState(
+                    axes=[0.0] * len(primary.axes),
+                    buttons=buttons,
+                    hats=hats,
+                    connected=False,
+                )
+            return JoystickState(
+                axes=list(primary.axes),
+                buttons=buttons,
+                hats=hats,
+                timestamp=primary.timestamp,
+            )
+
+        axes = [0.0] * self.num_axes
+        oldest = now
+        all_routed = True
+        for route in self.routes:
+            for candidate in route.candidates:
+                sample = samples[candidate.source]
+                if (
+                    sample is None
+                    or not self._is_live(sample, now)
+                    or candidate.axis_index >= len(sample.axes)
+                ):
+                    continue
+                value = sample.axes[candidate.axis_index]
+                if abs(value) >= candidate.override_threshold:
+                    axes[route.axis_index] = value
+                    oldest = min(oldest, sample.timestamp)
+                    break
+            else:
+                # Only the last candidate may sit inside its threshold; if it
+                # is also unavailable the axis stays centered
+                last = route.candidates[-1]
+                sample = samples[last.source]
+                if (
+                    sample is not None
+                    and self._is_live(sample, now)
+                    and last.axis_index < len(sample.axes)
+                ):
+                    oldest = min(oldest, sample.timestamp)
+                else:
+                    all_routed = False
+
+        return JoystickState(
+            axes=axes,
+            buttons=buttons,
+            hats=hats,
+            connected=all_routed,
+            timestamp=oldest,
+        )
+
+    def close(self) -> None:
+        """Stop sampling and close all sources."""
+        for name, source in self.sources.items():
+            sampler = self.samplers.get(name)
+            if sampler is None:
+                source.close()
+            else:
+                sampler.stop()
@@ -9,7 +9,9 @@ if __name__ == "__main__":
     if str(src_path) not in sys.path:
         sys.path.insert(0, str(src_path))
 
+from joystick.config import load_config
 from joystick.controller import JoystickController
+from joystick.pipeline import PipelineController
 
 
 def setup_logging(level: int = logging.INFO) -> None:
@@ -41,7 +43,12 @@ def main() -> None:
         sys.exit(1)
     
     try:
-        controller = JoystickController(config_path)
+        config = load_config(config_path)
+        controller: JoystickController | PipelineController
+        if config.get("pipeline", {}).get("mode") == "multiprocess":
+            controller = PipelineController(config_path)
+        else:
+            controller = JoystickController(config_path)
         controller.run()
     except Exception as e:
         logger.error(f"Fatal error: {e}", exc_info=True)
@@ -0,0 +1,404 @@
+"""
+Multi-process control pipeline.
+
+Splits the controller into three processes so input sampling, axis
+mapping and serial I/O no longer share one GIL:
+
+    input process  --axes-->  controller (mapping)  --commands-->  serial process
+
+Each arrow is a SharedState block in shared memory guarded by a seqlock.
+Only the latest values are exchanged, written in place as float64s, so
+nothing is pickled or queued per tick.
+"""
+import logging
+import multiprocessing as mp
+import struct
+import time
+from array import array
+from multiprocessing.shared_memory import SharedMemory
+from multiprocessing.synchronize import Event
+from pathlib import Path
+from typing import Any
+
+from joystick.config import ConfigWatcher, LoopSettings, load_config
+
+
+logger = logging.getLogger(__name__)
+
+
+# Fields per slot in the command block: servo_id, angle, move_time_ms
+COMMAND_FIELDS = 3
+# Maximum number of axes the command block can carry
+MAX_COMMAND_SLOTS = 64
+# Maximum number of input axes the axes block can carry
+MAX_INPUT_AXES = 64
+# How often the serial process checks for new commands
+SERIAL_POLL_INTERVAL = 0.001
+
+FLAG_CONNECTED = 0x1
+
+
+class SharedState:
+    """
+    Latest-value float64 vector in shared memory, guarded by a seqlock.
+
+    Layout: sequence (uint64), timestamp (float64), count (uint32),
+    flags (uint32), then `capacity` float64 values. The single writer
+    makes the sequence odd while it updates the block and even when done;
+    readers retry if the sequence was odd or changed while they copied.
+    Readers never block the writer, and a reader only ever sees complete
+    snapshots.
+    """
+
+    HEADER = struct.Struct("=QdII")
+
+    def __init__(self, capacity: int, name: str | None = None):
+        """
+        Create a new block, or attach to an existing one by name.
+
+        Args:
+            capacity: Maximum number of values in the block
+            name: Name of an existing block to attach to
+        """
+        size = self.HEADER.size + capacity * 8
+        self.capacity = capacity
+        self.shm = SharedMemory(name=name, create=name is None, size=size)
+        self.name = self.shm.name
+        self._owner = name is None
+
+        buf = self.shm.buf
+        assert buf is not None
+        self._buf = buf
+        self._seq = buf[:8].cast("Q")
+        self._values = buf[self.HEADER.size:size].cast("d")
+
+    def write(self, values: list[float], flags: int = 0, timestamp: float | None = None) -> None:
+        """
+        Publish a new snapshot. Must only be called from one process.
+
+        Args:
+            values: Values to publish (at most `capacity`)
+            flags: Bit flags stored alongside the values
+            timestamp: time.monotonic() of the snapshot; defaults to now
+        """
+        count = min(len(values), self.capacity)
+        if timestamp is None:
+            timestamp = time.monotonic()
+
+        seq = self._seq[0]
+        self._seq[0] = seq + 1
+        self.HEADER.pack_into(self._buf, 0, seq + 1, timestamp, count, flags)
+        self._values[:count] = array("d", values[:count])
+        self._seq[0] = seq + 2
+
+    def read(self, timeout: float = 1.0) -> tuple[int, float, int, list[float]]:
+        """
+        Copy the latest complete snapshot.
+
+        Args:
+            timeout: Give up after this many seconds without a complete
+                snapshot (a write takes microseconds, so this only
+                happens if the writer died in the middle of one)
+
+        Returns:
+            Tuple of (sequence, timestamp, flags, values). The sequence is
+            0 until the first write.
+
+        Raises:
+            TimeoutError: If no complete snapshot could be read in time
+        """
+        deadline = None
+        while True:
+            seq = self._seq[0]
+            if not seq & 1:
+                header = self.HEADER.unpack_from(self._buf, 0)
+                timestamp: float = header[1]
+                count: int = header[2]
+                flags: int = header[3]
+                values = list(self._values[:count])
+                if self._seq[0] == seq:
+                    return seq, timestamp, flags, values
+
+            if deadline is None:
+                deadline = time.monotonic() + timeout
+            elif time.monotonic() > deadline:
+                raise TimeoutError(
+                    f"Shared block {self.name} stayed mid-write for {timeout} s"
+                )
+
+    @property
+    def sequence(self) -> int:
+        """Sequence number of the latest snapshot (cheap change check)."""
+        return self._seq[0]
+
+    def close(self) -> None:
+        """Detach from the block, and free it if this process created it."""
+        self._seq.release()
+        self._values.release()
+        self._buf.release()
+        self.shm.close()
+        if self._owner:
+            self.shm.unlink()
+
+
+def _input_worker(config_path: str, axes_name: str, stop: Event, log_level: int) -> None:
+    """
+    Sample the input devices and publish raw axes. Runs in its own process.
+
+    Args:
+        config_path: Path to the YAML configuration file
+        axes_name: Name of the shared axes block
+        stop: Set by the parent to shut the process down
+        log_level: Logging level for this process
+    """
+    from joystick.controller import create_reader
+    from joystick.main import setup_logging
+
+    setup_logging(log_level)
+    config = load_config(config_path)
+    rate_hz = config.get("pipeline", {}).get("input_rate_hz", 250)
+    period = 1.0 / rate_hz
+
+    axes = SharedState(MAX_INPUT_AXES, name=axes_name)
+    reader = create_reader(config)
+    try:
+        next_sample = time.monotonic()
+        while not stop.is_set():
+            state = reader.read()
+            axes.write(
+                state.axes,
+                flags=FLAG_CONNECTED if state.connected else 0,
+                timestamp=state.timestamp,
+            )
+
+            next_sample += period
+            delay = next_sample - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                next_sample = time.monotonic()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        reader.close()
+        axes.close()
+
+
+def _serial_worker(config_path: str, commands_name: str, stop: Event, log_level: int) -> None:
+    """
+    Send changed command slots to the ESP32. Runs in its own process.
+
+    Args:
+        config_path: Path to the YAML configuration file
+        commands_name: Name of the shared command block
+        stop: Set by the parent to shut the process down
+        log_level: Logging level for this process
+    """
+    from joystick.comms.serial_link import ServoCommand
+    from joystick.controller import create_recorder, create_serial_link
+    from joystick.main import setup_logging
+
+    setup_logging(log_level)
+    config = load_config(config_path)
+
+    commands = SharedState(MAX_COMMAND_SLOTS * COMMAND_FIELDS, name=commands_name)
+    recorder = create_recorder(config)
+    try:
+        serial_link = create_serial_link(config["serial"], recorder)
+    except Exception:
+        if recorder is not None:
+            recorder.close()
+        commands.close()
+        raise
+    full_state = config["serial"].get("full_state", False)
+    last_sent: dict[int, tuple[int, int]] = {}
+    last_seq = 0
+    try:
+        while not stop.is_set():
+            if commands.sequence == last_seq:
+                time.sleep(SERIAL_POLL_INTERVAL)
+                continue
+
+            last_seq, _, _, values = commands.read()
+            batch = []
+            for i in range(0, len(values), COMMAND_FIELDS):
+                servo_id = int(values[i])
+                target = (int(values[i + 1]), int(values[i + 2]))
+                if not full_state and last_sent.get(servo_id) == target:
+                    continue
+                batch.append(ServoCommand(servo_id, *target))
+                last_sent[servo_id] = target
+            serial_link.send_commands(batch)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        serial_link.close()
+        if recorder is not None:
+            recorder.close()
+        commands.close()
+
+
+class PipelineController:
+    """
+    Controller that runs input sampling and serial I/O in separate processes.
+
+    This process only maps axes: it reads the latest raw axes from shared
+    memory, applies the AxisMapper, and publishes one command slot per
+    axis that the serial process turns into ServoCommands. Axis mapping
+    and send rate can be hot-reloaded as in JoystickController.
+    """
+
+    def __init__(self, config_path: str | Path):
+        """
+        Initialize the pipeline and start the worker processes.
+
+        Args:
+            config_path: Path to the YAML configuration file
+        """
+        self.config_path = str(config_path)
+        self.config = load_config(config_path)
+
+        self.settings = LoopSettings(self.config)
+        # Last value published per axis, in command slot order
+        self._targets: dict[str, tuple[int, int, int]] = {}
+        # Republish every tick so the serial process sends the full state
+        self.full_state = self.config["serial"].get("full_state", False)
+
+        self.config_watcher: ConfigWatcher | None = None
+        reload_config = self.config.get("reload", {})
+        if reload_config.get("enabled", True):
+            self.config_watcher = ConfigWatcher(
+                config_path,
+                self.settings.stage,
+                poll_interval=reload_config.get("poll_interval", 0.5),
+            )
+
+        self.axes = SharedState(MAX_INPUT_AXES)
+        self.commands = SharedState(MAX_COMMAND_SLOTS * COMMAND_FIELDS)
+
+        # pygame and pyserial state must not be inherited through fork
+        ctx = mp.get_context("spawn")
+        self._stop = ctx.Event()
+        log_level = logging.getLogger().getEffectiveLevel()
+        self.processes = [
+            ctx.Process(
+                target=_input_worker,
+                args=(self.config_path, self.axes.name, self._stop, log_level),
+                name="joystick-input",
+            ),
+            ctx.Process(
+                target=_serial_worker,
+                args=(self.config_path, self.commands.name, self._stop, log_level),
+                name="joystick-serial",
+            ),
+        ]
+        for process in self.processes:
+            process.start()
+
+        logger.info(f"Pipeline started with {len(self.settings.axis_mapper.configs)} axes")
+        logger.info(f"Update rate: {self.settings.send_rate_hz} Hz")
+
+    def _apply_staged_config(self) -> None:
+        """Adopt a staged configuration, if any. Called between ticks."""
+        if self.settings.apply():
+            # Drop targets of axes that no longer exist
+            axis_mapper = self.settings.axis_mapper
+            self._targets = {
+                name: target for name, target in self._targets.items()
+                if axis_mapper.get_config(name) is not None
+            }
+
+    def _check_workers(self) -> None:
+        """Raise if a worker process has died."""
+        for process in self.processes:
+            if not process.is_alive():
+                raise RuntimeError(
+                    f"Pipeline process {process.name} exited with code {process.exitcode}"
+                )
+
+    def run(self) -> None:
+        """
+        Run the mapping loop.
+
+        Reads the latest raw axes, maps them and publishes changed targets
+        to the serial process. Runs until interrupted with Ctrl+C.
+        """
+        logger.info("Starting pipeline. Press Ctrl+C to exit.")
+
+        if self.config_watcher is not None:
+            self.config_watcher.start()
+
+        try:
+            next_tick = time.monotonic()
+            while True:
+                self._apply_staged_config()
+                self._check_workers()
+
+                seq, _, _, raw_axes = self.axes.read()
+                if seq:
+                    mapped_values = self.settings.axis_mapper.process_axes(raw_axes)
+                    if self._update_targets(mapped_values) or self.full_state:
+                        self._publish_targets()
+
+                next_tick += self.settings.period
+                delay = next_tick - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                else:
+                    next_tick = time.monotonic()
+
+        except KeyboardInterrupt:
+            logger.info("Pipeline interrupted")
+        finally:
+            self.cleanup()
+
+    def _update_targets(self, mapped_values: dict[str, float]) -> bool:
+        """
+        Record targets for axes that have changed enough.
+
+        Args:
+            mapped_values: Mapped value per axis name
+
+        Returns:
+            True if any target changed
+        """
+        axis_mapper = self.settings.axis_mapper
+        changed = False
+        for axis_name, value in mapped_values.items():
+            if not axis_mapper.should_send(axis_name, value):
+                continue
+            config = axis_mapper.get_config(axis_name)
+            if config is None:
+                continue
+            self._targets[axis_name] = (
+                config.target_servo_id,
+                int(round(value)),
+                config.move_time_ms,
+            )
+            changed = True
+        return changed
+
+    def _publish_targets(self) -> None:
+        """Write all current targets to the shared command block."""
+        values: list[float] = []
+        for target in list(self._targets.values())[:MAX_COMMAND_SLOTS]:
+            values.extend(target)
+        self.commands.write(values)
+
+    def cleanup(self) -> None:
+        """Stop the worker processes and free shared memory."""
+        logger.info("Cleaning up...")
+        if self.config_watcher is not None:
+            self.config_watcher.stop()
+
+        self._stop.set()
+        for process in self.processes:
+            process.join(timeout=2.0)
+            if process.is_alive():
+                logger.warning(f"Terminating {process.name}")
+                process.terminate()
+                process.join()
+
+        self.axes.close()
+        self.commands.close()
+        logger.info("Shutdown complete")
@@ -1,10 +1,24 @@
 import logging
+import os
+import threading
+import time
+import weakref
+from dataclasses import dataclass, field
+
+# The controller never opens a window; keep SDL from connecting to a display
+# server when the event subsystem is initialized.
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
 import pygame
-from dataclasses import dataclass
 
 
 logger = logging.getLogger(__name__)
 
+# pygame keeps one global event queue, so device events are drained once and
+# handed to every open reader; the lock lets readers poll from different threads
+_pygame_lock = threading.RLock()
+_readers: "weakref.WeakSet[JoystickReader]" = weakref.WeakSet()
+
 
 @dataclass
 class JoystickState:
@@ -12,36 +26,135 @@ class JoystickState:
     axes: list[float]
     buttons: list[int]
     hats: list[tuple[int, int]]
+    connected: bool = True
+    timestamp: float = field(default_factory=time.monotonic)
 
 
 class JoystickReader:
-    """Reads input from a connected joystick device."""
+    """
+    Reads input from a connected joystick device.
+    
+    The device is tracked across unplug/replug: while it is missing,
+    read() returns a neutral state (all axes centered) with
+    connected=False, and the same model (matched by GUID) is reopened as
+    soon as SDL reports it again.
+    """
     
-    def __init__(self, joystick_index: int = 0):
+    def __init__(self, joystick_index: int = 0, pump_events: bool = True):
         """
         Initialize the joystick reader.
         
         Args:
             joystick_index: Index of the joystick to use (0 = first joystick)
+            pump_events: Pump the SDL event queue in read(). Pass False
+                when several readers share one pump: call
+                JoystickReader.pump() once on the main thread, then read
+                each of them (InputHub does this).
             
         Raises:
             RuntimeError: If no joystick is detected
         """
-        pygame.init()
-        pygame.joystick.init()
+        self.pump_events = pump_events
+        
+        # Only initialize what joystick polling needs: the event queue
+        # (owned by the display module) and the joystick subsystem.
+        # pygame.init() would also bring up audio, mixer and font.
+        with _pygame_lock:
+            pygame.display.init()
+            pygame.joystick.init()
+            # Axis/button state is read directly from the device, so only
+            # hot-plug notifications need to go through the event queue
+            pygame.event.set_blocked(None)
+            pygame.event.set_allowed([pygame.JOYDEVICEADDED, pygame.JOYDEVICEREMOVED])
 
-        if pygame.joystick.get_count() == 0:
-            raise RuntimeError("No joystick detected")
+            if joystick_index >= pygame.joystick.get_count():
+                raise RuntimeError(f"No joystick detected at index {joystick_index}")
 
-        self.joystick = pygame.joystick.Joystick(joystick_index)
-        self.joystick.init()
+            self.joystick: pygame.joystick.JoystickType | None = None
+            joystick = self._open(joystick_index)
+            self.guid = joystick.get_guid()
+            _readers.add(self)
 
-        self.num_axes = self.joystick.get_numaxes()
-        self.num_buttons = self.joystick.get_numbuttons()
-        self.num_hats = self.joystick.get_numhats()
+    def _open(self, device_index: int) -> pygame.joystick.JoystickType:
+        """
+        Open the joystick at a device index and cache its layout.
+        
+        Args:
+            device_index: SDL device index of the joystick
+            
+        Returns:
+            The opened joystick, also stored as self.joystick
+        """
+        joystick = pygame.joystick.Joystick(device_index)
+        joystick.init()
+        
+        self.joystick = joystick
+        self.num_axes = joystick.get_numaxes()
+        self.num_buttons = joystick.get_numbuttons()
+        self.num_hats = joystick.get_numhats()
 
-        logger.info(f"Joystick connected: {self.joystick.get_name()}")
+        logger.info(f"Joystick connected: {joystick.get_name()}")
         logger.info(f"Axes: {self.num_axes}, Buttons: {self.num_buttons}, Hats: {self.num_hats}")
+        return joystick
+
+    @staticmethod
+    def pump() -> None:
+        """
+        Pump SDL events, which refreshes the state of every open joystick,
+        and handle hot-plug events. SDL expects this on the main thread.
+        """
+        with _pygame_lock:
+            JoystickReader._dispatch_device_events()
+
+    @staticmethod
+    def _dispatch_device_events() -> None:
+        """Drain joystick hot-plug events and pass them to every reader."""
+        for event in pygame.event.get():
+            for reader in list(_readers):
+                reader._handle_device_event(event)
+
+    def _handle_device_event(self, event: pygame.event.Event) -> None:
+        """
+        Process a single joystick hot-plug event.
+        
+        Args:
+            event: JOYDEVICEADDED or JOYDEVICEREMOVED event
+        """
+        if event.type == pygame.JOYDEVICEREMOVED:
+            if (
+                self.joystick is not None
+                and event.instance_id == self.joystick.get_instance_id()
+            ):
+                self._mark_disconnected()
+        elif event.type == pygame.JOYDEVICEADDED and self.joystick is None:
+            try:
+                candidate = pygame.joystick.Joystick(event.device_index)
+                in_use = {
+                    reader.joystick.get_instance_id()
+                    for reader in _readers
+                    if reader.joystick is not None
+                }
+                if (
+                    candidate.get_guid() == self.guid
+                    and candidate.get_instance_id() not in in_use
+                ):
+                    self._open(event.device_index)
+            except pygame.error as e:
+                logger.error(f"Failed to open joystick: {e}")
+
+    def _mark_disconnected(self) -> None:
+        """Drop the current device after it has gone away."""
+        logger.warning("Joystick disconnected, waiting for it to come back")
+        self.joystick = None
+
+    def _neutral_state(self) -> JoystickState:
+        """State reported while the joystick is disconnected."""
+        return JoystickState(
+            axes=[0.0] * self.num_axes,
+            buttons=[0] * self.num_buttons,
+            hats=[(0, 0)] * self.num_hats,
+            connected=False,
+        )
 
     def read(self) -> JoystickState:
         """
@@ -50,11 +163,24 @@ class JoystickReader:
         Returns:
             JoystickState containing current axes, buttons, and hats
         """
-        pygame.event.pump()  # Required to update joystick state
+        with _pygame_lock:
+            if self.pump_events:
+                # Pumps the event queue, which is required to update joystick state
+                self._dispatch_device_events()
+            
+            if self.joystick is None:
+                return self._neutral_state()
 
-        axes = [self.joystick.get_axis(i) for i in range(self.num_axes)]
-        buttons = [self.joystick.get_button(i) for i in range(self.num_buttons)]
-        hats = [self.joystick.get_hat(i) for i in range(self.num_hats)]
+            try:
+                axes = [self.joystick.get_axis(i) for i in range(self.num_axes)]
+                buttons = [int(self.joystick.get_button(i)) for i in range(self.num_buttons)]
+                hats = [
+                    (int(x), int(y))
+                    for x, y in (self.joystick.get_hat(i) for i in range(self.num_hats))
+                ]
+            except pygame.error:
+                self._mark_disconnected()
+                return self._neutral_state()
 
         return JoystickState(
             axes=axes,
@@ -62,3 +188,10 @@ class JoystickReader:
             hats=hats,
         )
 
+    def close(self) -> None:
+        """Release the joystick device."""
+        with _pygame_lock:
+            _readers.discard(self)
+            if self.joystick is not None:
+                self.joystick.quit()
+                self.joystick = None
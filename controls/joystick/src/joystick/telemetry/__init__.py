@@ -0,0 +1,20 @@
+"""
+Telemetry recording, querying and live streaming.
+
+Export for the simulation plotting tools lives in joystick.telemetry.export
+(also runnable as `python -m joystick.telemetry.export`), and the live
+plot in joystick.telemetry.dashboard (needs the "dashboard" extra).
+"""
+
+from joystick.telemetry.pyramid import MinMaxPyramid
+from joystick.telemetry.sinks import TelemetryFanout, TelemetryPublisher, TelemetrySink
+from joystick.telemetry.store import TelemetryReader, TelemetryRecorder
+
+__all__ = [
+    "MinMaxPyramid",
+    "TelemetryFanout",
+    "TelemetryPublisher",
+    "TelemetryReader",
+    "TelemetryRecorder",
+    "TelemetrySink",
+]
@@ -0,0 +1,334 @@
+"""
+Live telemetry dashboard.
+
+Listens for TELEM datagrams from the controller (telemetry.publish in
+config.yaml) or straight from the SIL plant (sil.py --telem-to), and
+plots them as they arrive. Channel names are those of the simulation
+`history` dict (depth, target_depth, buoyancy, pump_cmd, ...) plus the
+controller's servo_<id>_target / motor_<id>_target / input_axis_<i>.
+
+    submarine-dashboard --port 5010
+    submarine-dashboard --panels "depth,target_depth;pump_cmd"
+
+Every channel is kept in a MinMaxPyramid, so memory is bounded and a
+redraw reads about one min/max bucket per pixel whether the window
+shows ten seconds or ten hours.
+
+Keys: left/right pan, up/down zoom in/out, f follow live data,
+a show everything received.
+
+Needs matplotlib: pip install "submarine-joystick[dashboard]"
+"""
+import argparse
+import fnmatch
+import logging
+import socket
+import threading
+import time
+from typing import TYPE_CHECKING
+
+from joystick.telemetry.pyramid import MinMaxPyramid
+
+if TYPE_CHECKING:
+    from matplotlib.backend_bases import KeyEvent
+    from matplotlib.lines import Line2D
+
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_PANELS = (
+    "depth,target_depth;buoyancy,target_buoyancy;pump_cmd,pump_active;"
+    "servo_*_target,motor_*_target"
+)
+
+
+class TelemetryListener:
+    """
+    Receives TELEM datagrams into one MinMaxPyramid per channel.
+
+    Samples are timestamped on arrival, in seconds since the listener
+    was created, so sources with different clocks share one time axis.
+    """
+
+    def __init__(self, host: str = "0.0.0.0", port: int = 5010, capacity: int = 4096):
+        """
+        Args:
+            host: Address to listen on
+            port: UDP port to listen on
+            capacity: Entries per pyramid level
+        """
+        self.capacity = capacity
+        self.channels: dict[str, MinMaxPyramid] = {}
+        self.datagrams = 0
+        self.origin = time.monotonic()
+        self._lock = threading.Lock()
+
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind((host, port))
+        self.sock.settimeout(0.2)
+        self._running = True
+        self._thread = threading.Thread(
+            target=self._receive_loop, name="dashboard-rx", daemon=True
+        )
+        self._thread.start()
+        logger.info(f"Listening for telemetry on udp://{host}:{port}")
+
+    def now(self) -> float:
+        """Current time on the listener's time axis."""
+        return time.monotonic() - self.origin
+
+    def _receive_loop(self) -> None:
+        while self._running:
+            try:
+                payload = self.sock.recv(65535)
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            self.handle(payload, self.now())
+
+    def handle(self, payload: bytes, t: float) -> None:
+        """
+        Add the TELEM lines of one datagram, all timestamped t.
+
+        Args:
+            payload: Datagram ("#<seq>" header and/or lines)
+            t: Arrival time on the listener's time axis
+        """
+        samples: list[tuple[str, float]] = []
+        for line in payload.decode("ascii", errors="ignore").splitlines():
+            if not line.startswith("TELEM,"):
+                continue
+            fields = line.strip().split(",")[1:]
+            for key, text in zip(fields[0::2], fields[1::2]):
+                try:
+                    # Same renaming as SerialLink: "time" is the plant's clock
+                    samples.append(("plant_time" if key == "time" else key, float(text)))
+                except ValueError:
+                    continue
+
+        with self._lock:
+            self.datagrams += 1
+            for name, value in samples:
+                pyramid = self.channels.get(name)
+                if pyramid is None:
+                    pyramid = self.channels[name] = MinMaxPyramid(self.capacity)
+                pyramid.append(t, value)
+
+    def names(self) -> list[str]:
+        """Channels received so far."""
+        with self._lock:
+            return list(self.channels)
+
+    def oldest(self) -> float | None:
+        """Earliest time still held by any channel."""
+        with self._lock:
+            starts = [
+                ring[0][0]
+                for pyramid in self.channels.values()
+                for ring in pyramid.levels
+                if ring
+            ]
+        return min(starts) if starts else None
+
+    def query(
+        self,
+        name: str,
+        t0: float,
+        t1: float,
+        max_points: int,
+    ) -> list[tuple[float, float, float]]:
+        """(time, min, max) entries of a channel in [t0, t1]."""
+        with self._lock:
+            pyramid = self.channels.get(name)
+            return [] if pyramid is None else pyramid.query(t0, t1, max_points)
+
+    def latest(self, name: str) -> tuple[float, float] | None:
+        """(time, value) of a channel's newest sample."""
+        with self._lock:
+            pyramid = self.channels.get(name)
+            return None if pyramid is None else pyramid.latest()
+
+    def close(self) -> None:
+        """Stop receiving and close the socket."""
+        self._running = False
+        self._thread.join()
+        self.sock.close()
+
+
+def parse_panels(text: str) -> list[list[str]]:
+    """
+    Parse a panel layout: panels separated by ";", channel names or
+    fnmatch patterns within a panel by ",".
+
+    Args:
+        text: Layout, e.g. "depth,target_depth;servo_*_target"
+
+    Returns:
+        List of pattern lists, one per panel
+    """
+    return [
+        [pattern.strip() for pattern in panel.split(",") if pattern.strip()]
+        for panel in text.split(";")
+        if panel.strip()
+    ]
+
+
+class Dashboard:
+    """Matplotlib figure with one panel per pattern list, redrawn on a timer."""
+
+    def __init__(
+        self,
+        listener: TelemetryListener,
+        panels: list[list[str]],
+        window: float = 60.0,
+        fps: float = 10.0,
+    ):
+        """
+        Args:
+            listener: Source of the data
+            panels: Channel patterns per panel, top to bottom
+            window: Initial visible time span in seconds
+            fps: Redraws per second
+        """
+        import matplotlib.pyplot as plt
+
+        self.plt = plt
+        self.listener = listener
+        self.panels = panels
+        self.window = window
+        self.fps = fps
+        # None follows the newest data; otherwise the right edge is fixed
+        self.end: float | None = None
+
+        self.fig, axes = plt.subplots(
+            len(panels), 1, sharex=True, squeeze=False, figsize=(12, 2.5 * len(panels))
+        )
+        self.axes = [row[0] for row in axes]
+        self.axes[-1].set_xlabel("Time (s)")
+        for ax in self.axes:
+            ax.grid(True)
+        # Channel name -> (panel index, line); (-1, None) if not plotted
+        self.lines: dict[str, tuple[int, Line2D | None]] = {}
+        self.fig.canvas.mpl_connect("key_press_event", self._on_key)
+
+    def _add_new_lines(self) -> None:
+        """Give every newly seen channel a line in the first panel it matches."""
+        for name in self.listener.names():
+            if name in self.lines:
+                continue
+            for i, patterns in enumerate(self.panels):
+                if any(fnmatch.fnmatchcase(name, pattern) for pattern in patterns):
+                    (line,) = self.axes[i].plot([], [], label=name, linewidth=1)
+                    self.lines[name] = (i, line)
+                    self.axes[i].legend(loc="upper left", fontsize="small")
+                    break
+            else:
+                # Not plotted; remember so it isn't matched again every frame
+                self.lines[name] = (-1, None)
+
+    def _on_key(self, event: "KeyEvent") -> None:
+        now = self.listener.now()
+        end = now if self.end is None else self.end
+        if event.key == "left":
+            self.end = end - self.window / 2
+        elif event.key == "right":
+            self.end = end + self.window / 2
+            if self.end >= now:
+                self.end = None
+        elif event.key == "up":
+            self.window = max(self.window / 2, 1.0)
+        elif event.key == "down":
+            self.window *= 2
+        elif event.key == "f":
+            self.end = None
+        elif event.key == "a":
+            oldest = self.listener.oldest()
+            if oldest is not None:
+                self.window = max(now - oldest, 1.0)
+            self.end = None
+        self.update()
+        self.fig.canvas.draw_idle()
+
+    def update(self, _frame: int | None = None) -> list:
+        """Redraw every line for the current window."""
+        self._add_new_lines()
+        end = self.listener.now() if self.end is None else self.end
+        start = end - self.window
+        # About one bucket per pixel column
+        max_points = max(int(self.axes[0].bbox.width), 100)
+
+        changed = []
+        for name, (panel, line) in self.lines.items():
+            if line is None:
+                continue
+            xs: list[float] = []
+            ys: list[float] = []
+            # Each bucket is drawn as a vertical stroke from its min to its
+            # max, which at one bucket per pixel looks like the raw trace
+            for t, low, high in self.listener.query(name, start, end, max_points):
+                xs += (t, t)
+                ys += (low, high)
+            # Hold the newest value to the right edge, even when it was
+            # sampled before the window; targets are only sent on change
+            latest = self.listener.latest(name)
+            if latest is not None and latest[0] < end:
+                xs.append(end)
+                ys.append(latest[1])
+            line.set_data(xs, ys)
+            changed.append(line)
+
+        for ax in self.axes:
+            ax.set_xlim(start, end)
+            ax.relim()
+            ax.autoscale_view(scalex=False)
+        mode = "live" if self.end is None else "paused (f: follow)"
+        self.axes[0].set_title(
+            f"{self.window:.0f} s window, {mode}, {self.listener.datagrams} datagrams"
+        )
+        return changed
+
+    def run(self) -> None:
+        """Show the window and redraw until it is closed."""
+        from matplotlib.animation import FuncAnimation
+
+        # Keep a reference, or the animation is garbage collected
+        self._animation = FuncAnimation(
+            self.fig, self.update, interval=1000 / self.fps, cache_frame_data=False
+        )
+        self.plt.show()
+
+
+def main() -> None:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Live plot of streamed telemetry")
+    parser.add_argument("--host", default="0.0.0.0", help="Address to listen on")
+    parser.add_argument("--port", type=int, default=5010, help="UDP port to listen on")
+    parser.add_argument(
+        "--panels",
+        default=DEFAULT_PANELS,
+        help="Panels separated by ';', channels (or fnmatch patterns) by ','",
+    )
+    parser.add_argument("--window", type=float, default=60.0, help="Initial time span in seconds")
+    parser.add_argument("--fps", type=float, default=10.0, help="Redraws per second")
+    parser.add_argument("--capacity", type=int, default=4096, help="Entries per resolution level")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    try:
+        import matplotlib  # noqa: F401
+    except ImportError:
+        parser.exit(1, 'The dashboard needs matplotlib: pip install "submarine-joystick[dashboard]"\n')
+
+    listener = TelemetryListener(args.host, args.port, args.capacity)
+    try:
+        Dashboard(listener, parse_panels(args.panels), args.window, args.fps).run()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        listener.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+Export telemetry recordings for the simulation plotting tools.
+
+Writes the same layout as the `history` dict in simulations/pid: a
+"time" list plus one equally long list per channel. Channels are
+resampled onto a uniform time base (sample-and-hold, null before a
+channel's first sample), and time starts at 0.
+
+    python -m joystick.telemetry.export recordings/20250101-120000 -o dive.json
+"""
+import argparse
+import json
+import math
+from pathlib import Path
+from typing import Any
+
+from joystick.telemetry.store import TelemetryReader
+
+
+def to_history(
+    reader: TelemetryReader,
+    channels: list[str] | None = None,
+    start: float | None = None,
+    end: float | None = None,
+    rate_hz: float = 20.0,
+) -> dict[str, list[Any]]:
+    """
+    Resample numeric channels of a recording onto a common time base.
+
+    Args:
+        reader: Open recording
+        channels: Channels to export (default: all numeric channels)
+        start: First timestamp to export (default: start of recording)
+        end: Last timestamp to export (default: end of recording)
+        rate_hz: Samples per second of the output
+
+    Returns:
+        History dictionary with "time" in seconds since start
+    """
+    time_range = reader.time_range()
+    if time_range is None:
+        return {"time": []}
+    start = time_range[0] if start is None else start
+    end = time_range[1] if end is None else end
+
+    data = reader.query(start, end, channels)
+    # Channels hold their value from before the window instead of
+    # starting out null
+    seeds = reader.latest_before(start, channels) if start > time_range[0] else {}
+    steps = int((end - start) * rate_hz) + 1
+    history: dict[str, list[Any]] = {"time": [i / rate_hz for i in range(steps)]}
+
+    for name in channels if channels is not None else reader.channels:
+        if name not in data and name not in seeds:
+            continue
+        samples = sorted(zip(*data[name])) if name in data else []
+        column: list[Any] = []
+        j = 0
+        current = seeds[name][1] if name in seeds else None
+        for i in range(steps):
+            t = start + i / rate_hz
+            while j < len(samples) and samples[j][0] <= t:
+                current = samples[j][1]
+                j += 1
+            # JSON has no NaN; missing values become null
+            column.append(None if current is None or math.isnan(current) else current)
+        history[name] = column
+    return history
+
+
+def export_history(
+    recording: str | Path,
+    output: str | Path,
+    channels: list[str] | None = None,
+    start: float | None = None,
+    end: float | None = None,
+    rate_hz: float = 20.0,
+) -> int:
+    """
+    Export a recording to a history JSON file.
+
+    Args:
+        recording: Recording directory
+        output: JSON file to write
+        channels: Channels to export (default: all numeric channels)
+        start: Seconds from the start of the recording to export from
+            (default: start of recording)
+        end: Seconds from the start of the recording to export up to
+            (default: end of recording)
+        rate_hz: Samples per second of the output
+
+    Returns:
+        Number of exported time steps
+    """
+    with TelemetryReader(recording) as reader:
+        time_range = reader.time_range()
+        origin = time_range[0] if time_range else 0.0
+        history = to_history(
+            reader,
+            channels,
+            start=None if start is None else origin + start,
+            end=None if end is None else origin + end,
+            rate_hz=rate_hz,
+        )
+    Path(output).write_text(json.dumps(history))
+    return len(history["time"])
+
+
+def main() -> None:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Export a telemetry recording to history JSON")
+    parser.add_argument("recording", help="Recording directory")
+    parser.add_argument("-o", "--output", required=True, help="JSON file to write")
+    parser.add_argument("-c", "--channels", help="Comma-separated channels (default: all)")
+    parser.add_argument("--start", type=float, help="Seconds from the start of the recording")
+    parser.add_argument("--end", type=float, help="Seconds from the start of the recording")
+    parser.add_argument("--rate", type=float, default=20.0, help="Output samples per second")
+    args = parser.parse_args()
+
+    steps = export_history(
+        args.recording,
+        args.output,
+        channels=args.channels.split(",") if args.channels else None,
+        start=args.start,
+        end=args.end,
+        rate_hz=args.rate,
+    )
+    print(f"Exported {steps} samples to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
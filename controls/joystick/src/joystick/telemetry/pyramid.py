@@ -0,0 +1,156 @@
+"""Bounded multi-resolution (min/max pyramid) history for live plotting."""
+import bisect
+import math
+
+
+class _Ring:
+    """Fixed-capacity ring of (time, min, max) entries, oldest first."""
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._items: list[tuple[float, float, float]] = []
+        self._start = 0
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __getitem__(self, i: int) -> tuple[float, float, float]:
+        return self._items[(self._start + i) % len(self._items)]
+
+    def append(self, entry: tuple[float, float, float]) -> None:
+        if len(self._items) < self.capacity:
+            self._items.append(entry)
+        else:
+            self._items[self._start] = entry
+            self._start = (self._start + 1) % self.capacity
+
+    def bisect_left(self, t: float) -> int:
+        return bisect.bisect_left(self, t, key=lambda entry: entry[0])
+
+    def bisect_right(self, t: float) -> int:
+        return bisect.bisect_right(self, t, key=lambda entry: entry[0])
+
+    def slice(self, lo: int, hi: int) -> list[tuple[float, float, float]]:
+        return [self[i] for i in range(lo, hi)]
+
+
+class MinMaxPyramid:
+    """
+    Decimated history of one channel at several resolutions.
+
+    Level 0 keeps the latest `capacity` raw samples. Every level above
+    keeps `capacity` buckets, each holding the start time, minimum and
+    maximum of `factor` buckets of the level below. Memory stays at
+    levels * capacity entries however long the run, level k reaches back
+    capacity * factor**k samples, and query() answers from the finest
+    level that covers the requested range within the point budget, so
+    drawing an hour costs the same as drawing a minute.
+
+    Min/max buckets keep spikes visible at every zoom level, which
+    averaging or plain subsampling would hide. NaN samples (e.g. no
+    setpoint under manual control) are kept at level 0 and ignored when
+    aggregating.
+
+    Samples must be appended in time order. Not thread-safe.
+    """
+
+    def __init__(self, capacity: int = 4096, factor: int = 4, levels: int = 8):
+        """
+        Args:
+            capacity: Entries kept per level
+            factor: Buckets of one level merged into a bucket of the next
+            levels: Number of levels, including the raw level
+        """
+        self.factor = factor
+        self.levels = [_Ring(capacity) for _ in range(levels)]
+        # Bucket under construction for the level above each level:
+        # [start time, min, max, merged count]
+        self._partial: list[list[float] | None] = [None] * (levels - 1)
+
+    def __len__(self) -> int:
+        return len(self.levels[0])
+
+    def append(self, t: float, value: float) -> None:
+        """Add a sample. Amortized O(1)."""
+        entry = (t, value, value)
+        for k in range(len(self.levels)):
+            self.levels[k].append(entry)
+            if k == len(self._partial):
+                return
+
+            partial = self._partial[k]
+            if partial is None:
+                self._partial[k] = partial = [entry[0], entry[1], entry[2], 0]
+            elif math.isnan(partial[1]):
+                partial[1], partial[2] = entry[1], entry[2]
+            elif not math.isnan(entry[1]):
+                partial[1] = min(partial[1], entry[1])
+                partial[2] = max(partial[2], entry[2])
+            partial[3] += 1
+
+            if partial[3] < self.factor:
+                return
+            entry = (partial[0], partial[1], partial[2])
+            self._partial[k] = None
+
+    def latest(self) -> tuple[float, float] | None:
+        """(time, value) of the newest sample, or None if empty."""
+        raw = self.levels[0]
+        if not raw:
+            return None
+        t, value, _ = raw[len(raw) - 1]
+        return t, value
+
+    def query(
+        self,
+        t0: float,
+        t1: float,
+        max_points: int = 1000,
+    ) -> list[tuple[float, float, float]]:
+        """
+        Return (time, min, max) entries covering [t0, t1].
+
+        Uses the finest level that still reaches back to t0 (or to the
+        oldest data kept) with at most max_points entries in range. The
+        entry just before t0 is included so lines run to the left edge.
+
+        Args:
+            t0: Start of the range
+            t1: End of the range
+            max_points: Point budget, e.g. the plot width in pixels
+
+        Returns:
+            Entries in time order; for raw samples min == max
+        """
+        non_empty = [ring for ring in self.levels if ring]
+        if not non_empty:
+            return []
+        oldest = min(ring[0][0] for ring in non_empty)
+
+        for ring in non_empty:
+            if ring[0][0] > max(t0, oldest):
+                # This level has already dropped part of the range
+                continue
+            lo = max(ring.bisect_left(t0) - 1, 0)
+            hi = ring.bisect_right(t1)
+            if hi - lo <= max_points:
+                return ring.slice(lo, hi)
+
+        # Even the coarsest level has too many entries: merge runs of them
+        ring = non_empty[-1]
+        lo = max(ring.bisect_left(t0) - 1, 0)
+        hi = ring.bisect_right(t1)
+        step = math.ceil((hi - lo) / max_points)
+        merged = []
+        for start in range(lo, hi, step):
+            group = [ring[i] for i in range(start, min(start + step, hi))]
+            finite = [entry for entry in group if not math.isnan(entry[1])]
+            if finite:
+                merged.append((
+                    group[0][0],
+                    min(entry[1] for entry in finite),
+                    max(entry[2] for entry in finite),
+                ))
+            else:
+                merged.append(group[0])
+        return merged
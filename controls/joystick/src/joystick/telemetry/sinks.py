@@ -0,0 +1,151 @@
+"""Telemetry destinations other than the on-disk recording."""
+import logging
+import socket
+from collections.abc import Iterable
+from typing import Protocol
+
+
+logger = logging.getLogger(__name__)
+
+
+class TelemetrySink(Protocol):
+    """Anything that accepts telemetry the way TelemetryRecorder does."""
+
+    def record(self, channel: str, value: float, timestamp: float | None = None) -> None:
+        """Take a numeric sample."""
+        ...
+
+    def record_many(
+        self,
+        samples: Iterable[tuple[str, float]],
+        timestamp: float | None = None,
+    ) -> None:
+        """Take several numeric samples taken at the same time."""
+        ...
+
+    def record_text(self, channel: str, text: str, timestamp: float | None = None) -> None:
+        """Take a text event."""
+        ...
+
+    def close(self) -> None:
+        """Flush and release resources."""
+        ...
+
+
+class TelemetryPublisher:
+    """
+    Streams numeric telemetry as UDP datagrams for live viewers.
+
+    Each record()/record_many() call becomes one datagram in the same
+    framing the SIL plant uses ("#<seq>" header line, then a TELEM
+    key/value line), so a viewer can listen to either. Sending never
+    blocks: if nobody is listening or the socket buffer is full, the
+    samples are dropped. Text events are not published.
+    """
+
+    # Stay under a typical Ethernet MTU so datagrams are not fragmented
+    MAX_PAYLOAD = 1400
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 5010):
+        """
+        Args:
+            host: Viewer address
+            port: Viewer UDP port
+        """
+        self.address = (host, port)
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.setblocking(False)
+        self._seq = 0
+        self.datagrams = 0
+        self.dropped = 0
+        logger.info(f"Publishing telemetry to udp://{host}:{port}")
+
+    def record(self, channel: str, value: float, timestamp: float | None = None) -> None:
+        """
+        Publish a numeric sample.
+
+        Args:
+            channel: Channel name
+            value: Sample value
+            timestamp: Ignored; viewers timestamp on arrival
+        """
+        self.record_many(((channel, value),))
+
+    def record_many(
+        self,
+        samples: Iterable[tuple[str, float]],
+        timestamp: float | None = None,
+    ) -> None:
+        """
+        Publish several numeric samples, split across datagrams if needed.
+
+        Args:
+            samples: (channel, value) pairs
+            timestamp: Ignored; viewers timestamp on arrival
+        """
+        fields = [f"{channel},{float(value):.6g}" for channel, value in samples]
+        start = 0
+        while start < len(fields):
+            end, size = start, len("TELEM\r\n")
+            while end < len(fields) and (
+                end == start or size + len(fields[end]) + 1 <= self.MAX_PAYLOAD
+            ):
+                size += len(fields[end]) + 1
+                end += 1
+            self._send("TELEM," + ",".join(fields[start:end]))
+            start = end
+
+    def record_text(self, channel: str, text: str, timestamp: float | None = None) -> None:
+        """Text events are only kept in recordings."""
+
+    def _send(self, line: str) -> None:
+        self._seq += 1
+        payload = f"#{self._seq}\n{line}\r\n".encode("ascii", errors="replace")
+        try:
+            self.sock.sendto(payload, self.address)
+            self.datagrams += 1
+        except OSError:
+            # No listener (ECONNREFUSED) or a full buffer; live data is
+            # disposable
+            self.dropped += 1
+
+    def close(self) -> None:
+        """Close the socket."""
+        self.sock.close()
+        logger.info(
+            f"Telemetry publisher closed: {self.datagrams} datagrams sent, "
+            f"{self.dropped} dropped"
+        )
+
+
+class TelemetryFanout:
+    """Forwards every call to several sinks, e.g. a recorder and a publisher."""
+
+    def __init__(self, sinks: Iterable[TelemetrySink]):
+        """
+        Args:
+            sinks: Destinations, called in order
+        """
+        self.sinks = list(sinks)
+
+    def record(self, channel: str, value: float, timestamp: float | None = None) -> None:
+        for sink in self.sinks:
+            sink.record(channel, value, timestamp)
+
+    def record_many(
+        self,
+        samples: Iterable[tuple[str, float]],
+        timestamp: float | None = None,
+    ) -> None:
+        # samples may be a one-shot iterator (e.g. zip)
+        samples = list(samples)
+        for sink in self.sinks:
+            sink.record_many(samples, timestamp)
+
+    def record_text(self, channel: str, text: str, timestamp: float | None = None) -> None:
+        for sink in self.sinks:
+            sink.record_text(channel, text, timestamp)
+
+    def close(self) -> None:
+        for sink in self.sinks:
+            sink.close()
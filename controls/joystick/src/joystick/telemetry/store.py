@@ -0,0 +1,504 @@
+"""
+Append-only telemetry recordings.
+
+A recording is a directory with three files:
+
+    channels.txt  one channel name per line; the line number is its id
+    data.bin      zlib-compressed chunks, appended back to back
+    index.bin     one INDEX entry per chunk: where it is in data.bin,
+                  the time range it covers and how many records it holds
+
+Each chunk holds up to chunk_size records in columnar form (all
+timestamps, then all channel ids, then all values), which compresses far
+better than interleaved rows. Text records (replies, status lines) are
+stored after the numeric columns of the same chunk. Columns are written
+in native byte order, which is little-endian on both the Pi and PCs.
+
+Chunks are appended to data.bin before their index entry, so a recording
+cut short by a crash or power loss is still readable up to the last
+complete chunk.
+"""
+import bisect
+import logging
+import math
+import mmap
+import struct
+import threading
+import time
+import zlib
+from array import array
+from collections import deque
+from collections.abc import Iterable
+from functools import lru_cache
+from pathlib import Path
+
+
+logger = logging.getLogger(__name__)
+
+
+CHANNELS_FILE = "channels.txt"
+DATA_FILE = "data.bin"
+INDEX_FILE = "index.bin"
+
+# Index entry: data offset, compressed length, first and last timestamp,
+# number of numeric records, number of text records
+INDEX = struct.Struct("<QIddII")
+# Chunk payload header: number of numeric records, number of text records
+CHUNK_HEADER = struct.Struct("<II")
+# Channel ids are stored as uint16
+MAX_CHANNELS = 1 << 16
+
+
+class TelemetryRecorder:
+    """
+    Records timestamped telemetry to disk from a background thread.
+
+    record() and record_text() only append to an in-memory queue, so they
+    are safe to call from the control loop and from any thread. The
+    writer thread encodes and compresses full chunks, and also writes out
+    partial chunks older than flush_interval so that little is lost if
+    the process dies. If the writer falls behind, the queue holds at most
+    max_queue records; the oldest are dropped and counted in `dropped`.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        chunk_size: int = 4096,
+        flush_interval: float = 5.0,
+        compression_level: int = 6,
+        max_queue: int = 100_000,
+    ):
+        """
+        Open (or continue) a recording and start the writer thread.
+
+        Args:
+            path: Recording directory; created if missing
+            chunk_size: Records per chunk
+            flush_interval: Maximum age in seconds of unwritten records
+            compression_level: zlib compression level (1-9)
+            max_queue: Maximum number of records waiting for the writer
+        """
+        self.path = Path(path)
+        # A new directory that never gets a record is removed again on close
+        self._created = not self.path.exists()
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.chunk_size = chunk_size
+        self.flush_interval = flush_interval
+        self.compression_level = compression_level
+        self._max_queue = max_queue
+
+        channels_path = self.path / CHANNELS_FILE
+        names = channels_path.read_text().splitlines() if channels_path.exists() else []
+        self._channel_ids = {name: i for i, name in enumerate(names)}
+        self._channels_full = False
+        self._channels_file = open(channels_path, "a")
+        self._data_file = open(self.path / DATA_FILE, "ab")
+        self._index_file = open(self.path / INDEX_FILE, "ab")
+        self._offset = self._data_file.tell()
+
+        # (timestamp, channel, value) tuples; deque appends are atomic, so
+        # producers never take a lock. A full deque discards its oldest end.
+        self._queue: deque[tuple[float, str, float | str]] = deque(maxlen=max_queue)
+        self._pending: list[tuple[float, str, float | str]] = []
+        self._pending_since = 0.0
+
+        self.records = 0
+        self.chunks = 0
+        self.bytes_written = 0
+        # Records lost because the queue was full; approximate under
+        # concurrent producers
+        self.dropped = 0
+
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._write_loop, name="telemetry-writer", daemon=True
+        )
+        self._thread.start()
+        logger.info(f"Recording telemetry to {self.path}")
+
+    def record(self, channel: str, value: float, timestamp: float | None = None) -> None:
+        """
+        Record a numeric sample.
+
+        Args:
+            channel: Channel name (e.g. "depth", "servo_1_target")
+            value: Sample value
+            timestamp: time.time() of the sample; defaults to now
+        """
+        self._enqueue(
+            (time.time() if timestamp is None else timestamp, channel, float(value))
+        )
+
+    def record_many(
+        self,
+        samples: Iterable[tuple[str, float]],
+        timestamp: float | None = None,
+    ) -> None:
+        """
+        Record several numeric samples taken at the same time.
+
+        Args:
+            samples: (channel, value) pairs
+            timestamp: time.time() of the samples; defaults to now
+        """
+        if timestamp is None:
+            timestamp = time.time()
+        batch = [(timestamp, channel, float(value)) for channel, value in samples]
+        overflow = len(self._queue) + len(batch) - self._max_queue
+        if overflow > 0:
+            self.dropped += min(overflow, self._max_queue)
+        self._queue.extend(batch)
+
+    def record_text(self, channel: str, text: str, timestamp: float | None = None) -> None:
+        """
+        Record a text event, such as a command or a line from the device.
+
+        Args:
+            channel: Channel name (e.g. "tx", "rx")
+            text: Event text
+            timestamp: time.time() of the event; defaults to now
+        """
+        self._enqueue(
+            (time.time() if timestamp is None else timestamp, channel, str(text))
+        )
+
+    def _enqueue(self, record: tuple[float, str, float | str]) -> None:
+        """Queue one record, counting the one dropped if the queue is full."""
+        if len(self._queue) >= self._max_queue:
+            self.dropped += 1
+        self._queue.append(record)
+
+    def _write_loop(self) -> None:
+        """Drain the queue into chunks until stopped. Runs in a separate thread."""
+        poll_interval = min(0.1, self.flush_interval)
+        while not self._stop.wait(poll_interval):
+            try:
+                self._drain()
+                if self._pending and time.monotonic() - self._pending_since >= self.flush_interval:
+                    self._write_chunk()
+            except Exception as e:
+                # Nothing may kill the writer, or record() keeps queueing
+                # for the rest of the run with nothing written. The failed
+                # chunk's records are already off _pending, so they are
+                # not retried forever.
+                if isinstance(e, OSError):
+                    logger.error(f"Telemetry write failed: {e}")
+                else:
+                    logger.exception("Telemetry writer error")
+        self._drain()
+        if self._pending:
+            self._write_chunk()
+
+    def _drain(self) -> None:
+        """Move queued records into chunks, writing every full chunk."""
+        while self._queue:
+            if not self._pending:
+                self._pending_since = time.monotonic()
+            self._pending.append(self._queue.popleft())
+            if len(self._pending) >= self.chunk_size:
+                self._write_chunk()
+
+    def _channel_id(self, name: str) -> int | None:
+        """
+        Look up a channel id, registering the channel if it is new.
+        Returns None for a new channel once MAX_CHANNELS are in use.
+        """
+        channel_id = self._channel_ids.get(name)
+        if channel_id is None:
+            channel_id = len(self._channel_ids)
+            if channel_id >= MAX_CHANNELS:
+                if not self._channels_full:
+                    logger.error(
+                        f"{MAX_CHANNELS} channels in use, dropping records of new channels"
+                    )
+                    self._channels_full = True
+                return None
+            self._channel_ids[name] = channel_id
+            self._channels_file.write(name + "\n")
+            # Must be on disk before any chunk that refers to it
+            self._channels_file.flush()
+        return channel_id
+
+    def _write_chunk(self) -> None:
+        """Encode, compress and append the pending records."""
+        records, self._pending = self._pending, []
+
+        timestamps, channels, values = array("d"), array("H"), array("d")
+        text_timestamps, text_channels, text_lengths = array("d"), array("H"), array("I")
+        texts: list[bytes] = []
+        for timestamp, name, value in records:
+            channel_id = self._channel_id(name)
+            if channel_id is None:
+                self.dropped += 1
+                continue
+            if isinstance(value, str):
+                encoded = value.encode("utf-8")
+                text_timestamps.append(timestamp)
+                text_channels.append(channel_id)
+                text_lengths.append(len(encoded))
+                texts.append(encoded)
+            else:
+                timestamps.append(timestamp)
+                channels.append(channel_id)
+                values.append(value)
+
+        payload = b"".join((
+            CHUNK_HEADER.pack(len(timestamps), len(text_timestamps)),
+            timestamps.tobytes(), channels.tobytes(), values.tobytes(),
+            text_timestamps.tobytes(), text_channels.tobytes(), text_lengths.tobytes(),
+            *texts,
+        ))
+        count = len(timestamps) + len(text_timestamps)
+        if not count:
+            return
+        blob = zlib.compress(payload, self.compression_level)
+
+        first = min(min(timestamps, default=math.inf), min(text_timestamps, default=math.inf))
+        last = max(max(timestamps, default=-math.inf), max(text_timestamps, default=-math.inf))
+        self._data_file.write(blob)
+        self._data_file.flush()
+        self._index_file.write(INDEX.pack(
+            self._offset, len(blob),
+            first, last,
+            len(timestamps), len(text_timestamps),
+        ))
+        self._index_file.flush()
+
+        self._offset += len(blob)
+        self.records += count
+        self.chunks += 1
+        self.bytes_written += len(blob)
+
+    def close(self) -> None:
+        """
+        Write out everything recorded so far and close the files. A
+        directory this recorder created is removed if nothing was recorded.
+        """
+        self._stop.set()
+        self._thread.join()
+        self._channels_file.close()
+        self._data_file.close()
+        self._index_file.close()
+        if self._created and self.records == 0:
+            for name in (CHANNELS_FILE, DATA_FILE, INDEX_FILE):
+                (self.path / name).unlink(missing_ok=True)
+            try:
+                self.path.rmdir()
+            except OSError:
+                # Something else was put there; leave it alone
+                pass
+            logger.info(f"Nothing recorded, removed {self.path}")
+            return
+        logger.info(
+            f"Telemetry recording closed: {self.records} records in "
+            f"{self.chunks} chunks, {self.bytes_written / 1024:.0f} KiB, "
+            f"{self.dropped} dropped"
+        )
+
+
+class TelemetryReader:
+    """
+    Reads a recording made by TelemetryRecorder.
+
+    data.bin is memory-mapped and only the chunks overlapping a queried
+    time range are decompressed, so opening and querying a multi-hour
+    recording costs time proportional to the range, not the file.
+    Recently decoded chunks are cached.
+    """
+
+    def __init__(self, path: str | Path, cache_size: int = 32):
+        """
+        Open a recording.
+
+        Args:
+            path: Recording directory
+            cache_size: Number of decoded chunks to keep in memory
+        """
+        self.path = Path(path)
+        self.channels = (self.path / CHANNELS_FILE).read_text().splitlines()
+        self._channel_ids = {name: i for i, name in enumerate(self.channels)}
+
+        index_bytes = (self.path / INDEX_FILE).read_bytes()
+        # Ignore a trailing partial entry left by an interrupted write
+        usable = len(index_bytes) - len(index_bytes) % INDEX.size
+        self.index = list(INDEX.iter_unpack(index_bytes[:usable]))
+
+        # Chunks are written in arrival order, but records from different
+        # threads may overlap slightly, so search on the running maximum
+        # of each chunk's last timestamp
+        self._first_times = [entry[2] for entry in self.index]
+        self._last_times_max: list[float] = []
+        latest = float("-inf")
+        for entry in self.index:
+            latest = max(latest, entry[3])
+            self._last_times_max.append(latest)
+
+        self._data_file = open(self.path / DATA_FILE, "rb")
+        size = self._data_file.seek(0, 2)
+        self._mmap = (
+            mmap.mmap(self._data_file.fileno(), 0, access=mmap.ACCESS_READ)
+            if size else None
+        )
+        self._decode = lru_cache(maxsize=cache_size)(self._decode_chunk)
+
+    def time_range(self) -> tuple[float, float] | None:
+        """
+        Returns:
+            (first, last) timestamp in the recording, or None if it is empty
+        """
+        if not self.index:
+            return None
+        return min(self._first_times), self._last_times_max[-1]
+
+    def _chunk_indices(self, start: float | None, end: float | None) -> range:
+        """Indices of the chunks that may hold records in [start, end]."""
+        first = 0 if start is None else bisect.bisect_left(self._last_times_max, start)
+        # Assume first timestamps grow too; chunks past the first one that
+        # starts after `end` are skipped
+        last = len(self.index) if end is None else bisect.bisect_right(self._first_times, end)
+        return range(first, max(first, last))
+
+    def _decode_chunk(self, i: int) -> tuple[array, array, array, array, array, list[str]]:
+        """Decompress chunk i into its numeric and text columns."""
+        # Only None for an empty data file, which has no chunks to decode
+        assert self._mmap is not None
+        offset, length, _, _, count, text_count = self.index[i]
+        payload = zlib.decompress(self._mmap[offset:offset + length])
+
+        pos = CHUNK_HEADER.size
+        columns = []
+        for typecode, n in (("d", count), ("H", count), ("d", count),
+                            ("d", text_count), ("H", text_count), ("I", text_count)):
+            column = array(typecode)
+            size = column.itemsize * n
+            column.frombytes(payload[pos:pos + size])
+            pos += size
+            columns.append(column)
+
+        texts = []
+        for length in columns[5]:
+            texts.append(payload[pos:pos + length].decode("utf-8"))
+            pos += length
+        return columns[0], columns[1], columns[2], columns[3], columns[4], texts
+
+    def query(
+        self,
+        start: float | None = None,
+        end: float | None = None,
+        channels: Iterable[str] | None = None,
+    ) -> dict[str, tuple[array, array]]:
+        """
+        Load numeric samples in a time range.
+
+        Args:
+            start: Earliest timestamp to include (default: beginning)
+            end: Latest timestamp to include (default: end)
+            channels: Channel names to load (default: all)
+
+        Returns:
+            {channel: (timestamps, values)} as float64 arrays, in recording order
+        """
+        wanted = None
+        if channels is not None:
+            wanted = {self._channel_ids[name] for name in channels if name in self._channel_ids}
+
+        lo = float("-inf") if start is None else start
+        hi = float("inf") if end is None else end
+        result: dict[int, tuple[array, array]] = {}
+        for i in self._chunk_indices(start, end):
+            timestamps, channel_ids, values, _, _, _ = self._decode(i)
+            for timestamp, channel_id, value in zip(timestamps, channel_ids, values):
+                if lo <= timestamp <= hi and (wanted is None or channel_id in wanted):
+                    column = result.get(channel_id)
+                    if column is None:
+                        column = result[channel_id] = (array("d"), array("d"))
+                    column[0].append(timestamp)
+                    column[1].append(value)
+
+        return {self.channels[channel_id]: column for channel_id, column in result.items()}
+
+    def latest_before(
+        self,
+        t: float,
+        channels: Iterable[str] | None = None,
+    ) -> dict[str, tuple[float, float]]:
+        """
+        Find the last numeric sample at or before a time, per channel.
+
+        Scans chunks backward from t and stops as soon as no earlier chunk
+        can hold a later sample of any requested channel. Without a
+        channel list it has to scan back to the beginning.
+
+        Args:
+            t: Timestamp to look back from
+            channels: Channel names to look up (default: all)
+
+        Returns:
+            {channel: (timestamp, value)} for channels with a sample at or
+            before t
+        """
+        wanted = None
+        if channels is not None:
+            wanted = {self._channel_ids[name] for name in channels if name in self._channel_ids}
+            if not wanted:
+                return {}
+
+        found: dict[int, tuple[float, float]] = {}
+        for i in reversed(range(bisect.bisect_right(self._first_times, t))):
+            if (
+                wanted is not None
+                and wanted <= found.keys()
+                and self._last_times_max[i] < min(found[c][0] for c in wanted)
+            ):
+                break
+            timestamps, channel_ids, values, _, _, _ = self._decode(i)
+            for timestamp, channel_id, value in zip(timestamps, channel_ids, values):
+                if timestamp <= t and (wanted is None or channel_id in wanted):
+                    best = found.get(channel_id)
+                    if best is None or timestamp >= best[0]:
+                        found[channel_id] = (timestamp, value)
+
+        return {self.channels[channel_id]: sample for channel_id, sample in found.items()}
+
+    def events(
+        self,
+        start: float | None = None,
+        end: float | None = None,
+        channels: Iterable[str] | None = None,
+    ) -> list[tuple[float, str, str]]:
+        """
+        Load text events in a time range.
+
+        Args:
+            start: Earliest timestamp to include (default: beginning)
+            end: Latest timestamp to include (default: end)
+            channels: Channel names to load (default: all)
+
+        Returns:
+            (timestamp, channel, text) tuples in recording order
+        """
+        wanted = None if channels is None else set(channels)
+        lo = float("-inf") if start is None else start
+        hi = float("inf") if end is None else end
+        result = []
+        for i in self._chunk_indices(start, end):
+            _, _, _, timestamps, channel_ids, texts = self._decode(i)
+            for timestamp, channel_id, text in zip(timestamps, channel_ids, texts):
+                name = self.channels[channel_id]
+                if lo <= timestamp <= hi and (wanted is None or name in wanted):
+                    result.append((timestamp, name, text))
+        return result
+
+    def close(self) -> None:
+        """Unmap and close the recording."""
+        self._decode.cache_clear()
+        if self._mmap is not None:
+            self._mmap.close()
+        self._data_file.close()
+
+    def __enter__(self) -> "TelemetryReader":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
@@ -0,0 +1,48 @@
+"""Tests for the shared-memory seqlock block used by the pipeline."""
+import pytest
+
+from joystick.pipeline import SharedState
+
+
+@pytest.fixture
+def state():
+    block = SharedState(8)
+    yield block
+    block.close()
+
+
+def test_read_before_first_write(state: SharedState) -> None:
+    assert state.read() == (0, 0.0, 0, [])
+
+
+def test_write_then_read(state: SharedState) -> None:
+    state.write([1.0, -0.5, 0.25], flags=1, timestamp=12.5)
+    assert state.read() == (2, 12.5, 1, [1.0, -0.5, 0.25])
+    assert state.sequence == 2
+
+
+def test_values_beyond_capacity_are_cut(state: SharedState) -> None:
+    state.write([float(i) for i in range(20)], timestamp=0.0)
+    assert state.read()[3] == [float(i) for i in range(8)]
+
+
+def test_shorter_snapshot_replaces_longer(state: SharedState) -> None:
+    state.write([1.0, 2.0, 3.0], timestamp=0.0)
+    state.write([4.0], timestamp=1.0)
+    assert state.read() == (4, 1.0, 0, [4.0])
+
+
+def test_attach_by_name_sees_writes(state: SharedState) -> None:
+    other = SharedState(8, name=state.name)
+    try:
+        state.write([3.0, 4.0], flags=0, timestamp=1.0)
+        assert other.read() == (2, 1.0, 0, [3.0, 4.0])
+    finally:
+        other.close()
+
+
+def test_read_times_out_on_a_write_left_half_done(state: SharedState) -> None:
+    # What a writer that died mid-write leaves behind: an odd sequence
+    state._seq[0] = 1
+    with pytest.raises(TimeoutError):
+        state.read(timeout=0.05)
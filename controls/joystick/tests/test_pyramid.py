@@ -0,0 +1,65 @@
+"""Tests for the min/max pyramid behind the live dashboard."""
+import math
+import random
+
+from joystick.telemetry.pyramid import MinMaxPyramid
+
+
+def fill(pyramid: MinMaxPyramid, values: list[float]) -> None:
+    for t, value in enumerate(values):
+        pyramid.append(float(t), value)
+
+
+def test_raw_level_when_within_budget() -> None:
+    pyramid = MinMaxPyramid(capacity=64, factor=4, levels=3)
+    fill(pyramid, [float(i) for i in range(50)])
+
+    entries = pyramid.query(10.0, 20.0, max_points=100)
+    # Includes the sample just before t0 so lines reach the left edge
+    assert [t for t, _, _ in entries] == [float(t) for t in range(9, 21)]
+    assert all(low == high for _, low, high in entries)
+
+
+def test_coarse_levels_keep_min_and_max() -> None:
+    rng = random.Random(1)
+    values = [rng.uniform(-1.0, 1.0) for _ in range(5000)]
+    values[3210] = 50.0
+    values[4321] = -50.0
+    pyramid = MinMaxPyramid(capacity=256, factor=4, levels=6)
+    fill(pyramid, values)
+
+    entries = pyramid.query(0.0, 4999.0, max_points=200)
+    assert len(entries) <= 200
+    assert max(high for _, _, high in entries) == 50.0
+    assert min(low for _, low, _ in entries) == -50.0
+    # Each bucket covers the samples from its start time to the next one
+    starts = [int(t) for t, _, _ in entries] + [len(values)]
+    for (t, low, high), end in zip(entries, starts[1:]):
+        bucket = values[int(t):end]
+        assert low == min(bucket) and high == max(bucket)
+
+
+def test_range_older_than_the_raw_level_uses_a_coarser_level() -> None:
+    pyramid = MinMaxPyramid(capacity=32, factor=4, levels=4)
+    fill(pyramid, [float(i) for i in range(1000)])
+
+    entries = pyramid.query(0.0, 999.0, max_points=1000)
+    # Only the top level (64 samples per bucket) still reaches back to 0
+    assert entries[0] == (0.0, 0.0, 63.0)
+    assert [t for t, _, _ in entries] == [64.0 * i for i in range(len(entries))]
+
+
+def test_nan_samples_do_not_poison_buckets() -> None:
+    pyramid = MinMaxPyramid(capacity=16, factor=4, levels=3)
+    fill(pyramid, [math.nan, 1.0, math.nan, 3.0] * 20)
+
+    for _, low, high in pyramid.query(0.0, 79.0, max_points=10):
+        assert (low, high) == (1.0, 3.0)
+
+
+def test_latest_and_empty() -> None:
+    pyramid = MinMaxPyramid()
+    assert pyramid.latest() is None
+    assert pyramid.query(0.0, 1.0) == []
+    pyramid.append(2.0, 7.0)
+    assert pyramid.latest() == (2.0, 7.0)
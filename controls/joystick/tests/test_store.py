@@ -0,0 +1,79 @@
+"""Round-trip tests for the telemetry recorder and reader."""
+from pathlib import Path
+
+from joystick.telemetry.store import TelemetryReader, TelemetryRecorder
+
+
+def record(path: Path, **kwargs) -> TelemetryRecorder:
+    recorder = TelemetryRecorder(path, chunk_size=4, flush_interval=60.0, **kwargs)
+    for i in range(10):
+        recorder.record_many(
+            [("depth", float(i)), ("pump_cmd", -float(i))], timestamp=100.0 + i
+        )
+    recorder.record("target_depth", 2.5, timestamp=103.5)
+    recorder.record_text("rx", "OK", timestamp=104.0)
+    recorder.close()
+    return recorder
+
+
+def test_round_trip(tmp_path: Path) -> None:
+    recorder = record(tmp_path / "run")
+    assert recorder.records == 22
+    assert recorder.chunks == 6
+
+    with TelemetryReader(tmp_path / "run") as reader:
+        assert reader.time_range() == (100.0, 109.0)
+        data = reader.query()
+        assert list(data["depth"][0]) == [100.0 + i for i in range(10)]
+        assert list(data["pump_cmd"][1]) == [-float(i) for i in range(10)]
+        assert list(data["target_depth"][1]) == [2.5]
+        assert reader.events() == [(104.0, "rx", "OK")]
+
+
+def test_query_range_and_channels(tmp_path: Path) -> None:
+    record(tmp_path / "run")
+    with TelemetryReader(tmp_path / "run") as reader:
+        data = reader.query(103.0, 105.0, channels=["depth", "missing"])
+        assert list(data) == ["depth"]
+        assert list(data["depth"][1]) == [3.0, 4.0, 5.0]
+
+
+def test_latest_before(tmp_path: Path) -> None:
+    record(tmp_path / "run")
+    with TelemetryReader(tmp_path / "run") as reader:
+        assert reader.latest_before(107.5, ["target_depth", "depth"]) == {
+            "target_depth": (103.5, 2.5),
+            "depth": (107.0, 7.0),
+        }
+        assert reader.latest_before(99.0, ["depth"]) == {}
+
+
+def test_continues_an_existing_recording(tmp_path: Path) -> None:
+    record(tmp_path / "run")
+    recorder = TelemetryRecorder(tmp_path / "run")
+    recorder.record("depth", 99.0, timestamp=200.0)
+    recorder.record("new_channel", 1.0, timestamp=200.0)
+    recorder.close()
+
+    with TelemetryReader(tmp_path / "run") as reader:
+        data = reader.query(150.0)
+        assert list(data["depth"][1]) == [99.0]
+        assert list(data["new_channel"][1]) == [1.0]
+
+
+def test_empty_recording_is_removed(tmp_path: Path) -> None:
+    TelemetryRecorder(tmp_path / "run").close()
+    assert not (tmp_path / "run").exists()
+
+
+def test_full_queue_drops_oldest(tmp_path: Path) -> None:
+    recorder = TelemetryRecorder(tmp_path / "run", max_queue=5)
+    # Hold the writer so everything stays queued
+    recorder._stop.set()
+    recorder._thread.join()
+    for i in range(8):
+        recorder.record("depth", float(i), timestamp=float(i))
+    recorder.record_many([("depth", 8.0), ("depth", 9.0)], timestamp=8.0)
+    assert recorder.dropped == 5
+    assert [value for _, _, value in recorder._queue] == [5.0, 6.0, 7.0, 8.0, 9.0]
+    recorder.close()
@@ -0,0 +1,58 @@
+"""Tests for the UDP datagram sequencing in joystick.comms.transport."""
+from joystick.comms.transport import LinkStats, SequenceTracker
+
+
+def make_tracker() -> tuple[SequenceTracker, LinkStats]:
+    stats = LinkStats()
+    return SequenceTracker(stats), stats
+
+
+def test_accepts_in_order_datagrams() -> None:
+    tracker, stats = make_tracker()
+    assert [tracker.accept(seq) for seq in (1, 2, 3)] == [True, True, True]
+    assert (stats.received, stats.lost, stats.reordered, stats.duplicates) == (3, 0, 0, 0)
+
+
+def test_gap_counts_as_lost_until_late_arrival() -> None:
+    tracker, stats = make_tracker()
+    tracker.accept(1)
+    assert tracker.accept(4)
+    assert stats.lost == 2
+
+    # A late first arrival is dropped, but no longer counted lost
+    assert not tracker.accept(3)
+    assert (stats.lost, stats.reordered) == (1, 1)
+
+
+def test_redundant_copies_are_duplicates() -> None:
+    tracker, stats = make_tracker()
+    tracker.accept(2)
+    tracker.accept(3)
+    assert not tracker.accept(3)
+    assert not tracker.accept(2)
+    assert (stats.duplicates, stats.reordered, stats.lost) == (2, 0, 0)
+
+
+def test_outside_window_is_reordered_without_touching_lost() -> None:
+    tracker, stats = make_tracker()
+    tracker.accept(1)
+    tracker.accept(2 + SequenceTracker.WINDOW)
+    lost = stats.lost
+    assert not tracker.accept(2)
+    assert (stats.lost, stats.reordered) == (lost, 1)
+
+
+def test_sender_restart_resynchronizes() -> None:
+    tracker, stats = make_tracker()
+    for seq in range(1, 501):
+        tracker.accept(seq)
+    assert tracker.accept(1)
+    assert tracker.highest == 1
+    assert tracker.accept(2)
+
+
+def test_large_backward_jump_resynchronizes() -> None:
+    tracker, _ = make_tracker()
+    tracker.accept(5000)
+    assert tracker.accept(5000 - SequenceTracker.RESTART_GAP - 1)
+    assert not tracker.accept(5000 - SequenceTracker.RESTART_GAP - 2)
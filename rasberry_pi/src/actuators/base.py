@@ -1,3 +1,55 @@
+# Resolution of the value -> duty lookup table over [-1, 1]
+LUT_SIZE = 2001
+
+
 class Actuator:
+    """
+    Common target/interpolation state for PWM actuators.
+
+    set() writes a value immediately. The runtime instead calls
+    set_target() when a command arrives and update() once per tick, which
+    moves the current value toward the target under the subclass's motion
+    limits; duty() then turns it into a PCA9685 duty cycle via a table
+    precomputed from pulse_us(), so the tick does no pulse-width math.
+    """
+
+    def __init__(self, pwm, channel):
+        self.pwm = pwm
+        self.channel = channel
+        self.value = 0.0
+        self.target = 0.0
+        self._lut = None
+
+    def pulse_us(self, value: float) -> float:
+        raise NotImplementedError
+
     def set(self, value: float):
         raise NotImplementedError
+
+    def set_target(self, value: float, move_time_ms: int = 0):
+        self.target = max(-1.0, min(1.0, value))
+
+    def update(self, dt: float) -> float:
+        """Advance the current value by dt seconds and return it."""
+        self.value = self.target
+        return self.value
+
+    def jump_to(self, value: float):
+        """Set both target and current value with no interpolation."""
+        self.set_target(value)
+        self.value = self.target
+
+    def duty(self, value: float) -> int:
+        if self._lut is None:
+            self._lut = [
+                self.pwm.duty_for_pulse(self.pulse_us(-1.0 + 2.0 * i / (LUT_SIZE - 1)))
+                for i in range(LUT_SIZE)
+            ]
+        index = int((value + 1.0) * ((LUT_SIZE - 1) / 2) + 0.5)
+        return self._lut[max(0, min(LUT_SIZE - 1, index))]
+
+
+def step_toward(current: float, target: float, max_step: float) -> float:
+    if target > current:
+        return min(target, current + max_step)
+    return max(target, current - max_step)
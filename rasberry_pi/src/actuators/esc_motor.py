@@ -1,18 +1,58 @@
-from .base import Actuator
+import math
+
+from .base import Actuator, step_toward
 
 class ESCMotor(Actuator):
     def __init__(self, pwm, channel,
-                 min_us=1100, neutral_us=1500, max_us=1900):
-        self.pwm = pwm
-        self.channel = channel
+                 min_us=1100, neutral_us=1500, max_us=1900,
+                 max_rate=None, max_accel=None):
+        """
+        max_rate limits how fast the throttle changes (full-scale units per
+        second) and max_accel how fast that rate itself changes (units/s^2),
+        giving smooth ramps that avoid current spikes. None disables a limit.
+        """
+        super().__init__(pwm, channel)
         self.min_us = min_us
         self.neutral_us = neutral_us
         self.max_us = max_us
+        self.max_rate = max_rate
+        self.max_accel = max_accel
+        self._rate = 0.0
 
-    def set(self, value: float):
+    def pulse_us(self, value: float) -> float:
         value = max(-1.0, min(1.0, value))
         if value >= 0:
-            pulse = self.neutral_us + value * (self.max_us - self.neutral_us)
+            return self.neutral_us + value * (self.max_us - self.neutral_us)
+        return self.neutral_us + value * (self.neutral_us - self.min_us)
+
+    def set(self, value: float):
+        self.pwm.set_pulse_us(self.channel, self.pulse_us(value))
+
+    def jump_to(self, value: float):
+        super().jump_to(value)
+        self._rate = 0.0
+
+    def update(self, dt: float) -> float:
+        error = self.target - self.value
+        if self.max_rate is None and self.max_accel is None:
+            self.value = self.target
+            return self.value
+
+        # Fastest rate that can still stop at the target under max_accel
+        desired = math.inf if self.max_rate is None else self.max_rate
+        if self.max_accel is not None:
+            desired = min(desired, math.sqrt(2 * self.max_accel * abs(error)))
+        desired = math.copysign(desired, error) if error else 0.0
+
+        if self.max_accel is None:
+            self._rate = desired
         else:
-            pulse = self.neutral_us + value * (self.neutral_us - self.min_us)
-        self.pwm.set_pulse_us(self.channel, pulse)
+            self._rate = step_toward(self._rate, desired, self.max_accel * dt)
+
+        new_value = self.value + self._rate * dt
+        if (self.target - self.value) * (self.target - new_value) <= 0:
+            # Reached or stepped past the target
+            new_value = self.target
+            self._rate = 0.0
+        self.value = max(-1.0, min(1.0, new_value))
+        return self.value
@@ -1,13 +1,38 @@
-from .base import Actuator
+from .base import Actuator, step_toward
 
 class Servo(Actuator):
-    def __init__(self, pwm, channel, min_us=1000, max_us=2000):
-        self.pwm = pwm
-        self.channel = channel
+    def __init__(self, pwm, channel, min_us=1000, max_us=2000, max_speed=None):
+        """max_speed limits travel in full-scale units (the [-1, 1] range) per second."""
+        super().__init__(pwm, channel)
         self.min_us = min_us
         self.max_us = max_us
+        self.max_speed = max_speed
+        self._speed = max_speed
 
-    def set(self, value: float):
+    def pulse_us(self, value: float) -> float:
         value = max(-1.0, min(1.0, value))
-        pulse = self.min_us + (value + 1) / 2 * (self.max_us - self.min_us)
-        self.pwm.set_pulse_us(self.channel, pulse)
+        return self.min_us + (value + 1) / 2 * (self.max_us - self.min_us)
+
+    def set(self, value: float):
+        self.pwm.set_pulse_us(self.channel, self.pulse_us(value))
+
+    def set_target(self, value: float, move_time_ms: int = 0):
+        """Move to value in a straight line over move_time_ms (0 = as fast as allowed)."""
+        if max(-1.0, min(1.0, value)) == self.target:
+            # Repeats (full-state streaming) must not re-plan the move, or
+            # each one would push the arrival time out again
+            return
+        super().set_target(value)
+        speed = None
+        if move_time_ms > 0:
+            speed = abs(self.target - self.value) / (move_time_ms / 1000)
+        if self.max_speed is not None:
+            speed = self.max_speed if speed is None else min(speed, self.max_speed)
+        self._speed = speed
+
+    def update(self, dt: float) -> float:
+        if self._speed is None:
+            self.value = self.target
+        else:
+            self.value = step_toward(self.value, self.target, self._speed * dt)
+        return self.value
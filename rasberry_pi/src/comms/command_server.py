@@ -0,0 +1,50 @@
+import logging
+import socketserver
+import threading
+
+from .commands import parse_command
+
+logger = logging.getLogger(__name__)
+
+
+class _LineHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        peer = "%s:%d" % self.client_address[:2]
+        logger.info(f"Topside connected from {peer}")
+        for raw in self.rfile:
+            line = raw.decode("ascii", errors="ignore").strip()
+            if not line:
+                continue
+            try:
+                replies = self.server.handler(parse_command(line))
+            except ValueError as e:
+                replies = [f"ERROR: {e}"]
+            for reply in replies:
+                self.wfile.write((reply + "\r\n").encode("ascii"))
+        logger.info(f"Topside {peer} disconnected")
+
+
+class _Server(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class CommandServer:
+    """
+    Accepts newline-delimited commands over TCP and passes each parsed
+    Command to handler, which returns the lines to send back.
+    """
+
+    def __init__(self, handler, host="0.0.0.0", port=5005):
+        self._server = _Server((host, port), _LineHandler)
+        self._server.handler = handler
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    def start(self):
+        self._thread.start()
+        host, port = self._server.server_address[:2]
+        logger.info(f"Listening for commands on {host}:{port}")
+
+    def close(self):
+        self._server.shutdown()
+        self._server.server_close()
@@ -0,0 +1,44 @@
+"""
+Parser for the line protocol the topside SerialLink speaks:
+
+    SERVO,<id>,angle,<-100..100>,time,<ms>
+    MOTOR,<id>,speed,<-100..100>
+    STOP_ALL
+    STATUS
+"""
+
+
+class Command:
+    def __init__(self, kind: str, device_id=None, params=None):
+        self.kind = kind
+        self.device_id = device_id
+        self.params = params or {}
+
+    def __repr__(self):
+        return f"Command({self.kind}, {self.device_id}, {self.params})"
+
+
+def parse_command(line: str) -> Command:
+    """Parse one protocol line. Raises ValueError if it is malformed."""
+    line = line.strip()
+    if line in ("STATUS", "STOP_ALL"):
+        return Command(line)
+
+    fields = line.split(",")
+    if len(fields) < 2 or fields[0] not in ("SERVO", "MOTOR"):
+        raise ValueError(f"Unknown command: {line}")
+
+    # Remaining fields are key,value pairs, e.g. angle,45,time,500
+    pairs = fields[2:]
+    if len(pairs) % 2:
+        raise ValueError(f"Unpaired parameter in: {line}")
+    try:
+        device_id = int(fields[1])
+        params = {pairs[i]: int(pairs[i + 1]) for i in range(0, len(pairs), 2)}
+    except ValueError:
+        raise ValueError(f"Non-integer value in: {line}") from None
+
+    required = "angle" if fields[0] == "SERVO" else "speed"
+    if required not in params:
+        raise ValueError(f"Missing {required} in: {line}")
+    return Command(fields[0], device_id, params)
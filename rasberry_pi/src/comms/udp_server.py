@@ -0,0 +1,156 @@
+import logging
+import socket
+import threading
+import time
+
+from .commands import parse_command
+
+logger = logging.getLogger(__name__)
+
+MAX_DATAGRAM = 65507
+
+
+class SequenceTracker:
+    """
+    Latest-wins filter for "#<seq>"-numbered datagrams from one sender.
+    Newer datagrams are accepted; older ones are dropped and counted as
+    reordered (late first arrival) or duplicates (redundant copies).
+
+    Mirrors SequenceTracker in controls/joystick/src/joystick/comms/transport.py
+    (the topside copy); the two deploy separately, keep accept() in sync.
+    """
+
+    WINDOW = 64
+    RESTART_GAP = 1024
+
+    def __init__(self):
+        self.highest = None
+        self._seen = 0  # bit i set if (highest - i) was received
+        self.received = 0
+        self.lost = 0
+        self.reordered = 0
+        self.duplicates = 0
+
+    def accept(self, seq: int) -> bool:
+        if self.highest is not None and (
+            seq == 1 and self.highest > 1
+            or self.highest - seq > self.RESTART_GAP
+        ):
+            # Sender restarted its sequence
+            self.highest = None
+            self._seen = 0
+
+        if self.highest is None or seq > self.highest:
+            if self.highest is not None:
+                gap = seq - self.highest
+                self.lost += gap - 1
+                self._seen = (self._seen << gap) & ((1 << self.WINDOW) - 1)
+            self._seen |= 1
+            self.highest = seq
+            self.received += 1
+            return True
+
+        offset = self.highest - seq
+        if offset < self.WINDOW and self._seen & (1 << offset):
+            self.duplicates += 1
+        else:
+            if offset < self.WINDOW:
+                self._seen |= 1 << offset
+                self.lost -= 1
+            self.reordered += 1
+        return False
+
+    def __str__(self):
+        return (
+            f"received={self.received} lost={self.lost} "
+            f"reordered={self.reordered} duplicates={self.duplicates}"
+        )
+
+
+class UdpCommandServer:
+    """
+    Accepts command datagrams from the topside UdpTransport.
+
+    Each datagram starts with "#<seq>" followed by one or more command
+    lines. Datagrams older than the newest one already applied from the
+    same sender are dropped, so stale state never overrides fresh state.
+    Replies go back to the sender as one datagram with its own sequence.
+    """
+
+    STATS_INTERVAL = 10.0
+    # Pause after a failed receive so a persistent error doesn't spin
+    ERROR_BACKOFF = 0.1
+
+    def __init__(self, handler, host="0.0.0.0", port=5005):
+        self.handler = handler
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind((host, port))
+        self.trackers = {}
+        self._tx_seq = 0
+        self._running = False
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+
+    def start(self):
+        self._running = True
+        self._thread.start()
+        host, port = self.sock.getsockname()[:2]
+        logger.info(f"Listening for command datagrams on {host}:{port}")
+
+    def _serve(self):
+        next_stats = time.monotonic() + self.STATS_INTERVAL
+        while self._running:
+            try:
+                datagram, peer = self.sock.recvfrom(MAX_DATAGRAM)
+            except OSError as e:
+                if not self._running:
+                    # close() shut the socket
+                    break
+                logger.error(f"UDP receive failed: {e}")
+                time.sleep(self.ERROR_BACKOFF)
+                continue
+
+            # Nothing may end this thread while the runtime is up: the
+            # process would stay alive, so systemd never restarts it, but
+            # commands would no longer be accepted
+            try:
+                self._handle_datagram(datagram, peer)
+            except Exception as e:
+                if isinstance(e, OSError):
+                    # e.g. ENETUNREACH on the reply while the tether flaps
+                    logger.error(f"UDP reply to {peer[0]}:{peer[1]} failed: {e}")
+                else:
+                    logger.exception(f"Error handling datagram from {peer[0]}:{peer[1]}")
+
+            if time.monotonic() >= next_stats:
+                next_stats += self.STATS_INTERVAL
+                for (host, port), tracker in self.trackers.items():
+                    logger.info(f"UDP {host}:{port}: {tracker}")
+
+    def _handle_datagram(self, datagram, peer):
+        lines = datagram.decode("ascii", errors="ignore").splitlines()
+        if lines and lines[0].startswith("#"):
+            tracker = self.trackers.setdefault(peer, SequenceTracker())
+            try:
+                if not tracker.accept(int(lines[0][1:])):
+                    return
+            except ValueError:
+                return
+            lines = lines[1:]
+
+        replies = []
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                replies.extend(self.handler(parse_command(line)))
+            except ValueError as e:
+                replies.append(f"ERROR: {e}")
+
+        if replies:
+            self._tx_seq += 1
+            payload = f"#{self._tx_seq}\n" + "".join(r + "\r\n" for r in replies)
+            self.sock.sendto(payload.encode("ascii"), peer)
+
+    def close(self):
+        self._running = False
+        self.sock.close()
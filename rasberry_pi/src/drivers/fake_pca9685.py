@@ -0,0 +1,121 @@
+"""
+In-memory PCA9685 and I2C bus for running the actuator stack off the Pi.
+
+FakeI2CBus records every transaction with a timestamp, counts
+transactions and bytes, and estimates how long each one would occupy a
+real bus at the configured clock (100 kHz standard mode, 400 kHz fast
+mode). With simulate_timing=True it also holds the bus for that long,
+so loop timing and contention behave like the real hardware.
+"""
+import threading
+import time
+from collections import deque
+
+MODE1 = 0x00
+PRESCALE = 0xFE
+LED0_ON_L = 0x06
+MODE1_SLEEP = 0x10
+MODE1_AI = 0x20
+MODE1_RESTART = 0x80
+OSC_HZ = 25_000_000
+# Final stretch of a simulated transfer that is busy-waited instead of slept
+SPIN_S = 0.0002
+
+
+class I2CTransaction:
+    __slots__ = ("timestamp", "address", "data", "duration_s")
+
+    def __init__(self, timestamp, address, data, duration_s):
+        self.timestamp = timestamp
+        self.address = address
+        self.data = data
+        self.duration_s = duration_s
+
+    def __repr__(self):
+        return f"I2CTransaction(0x{self.address:02X}, {self.data.hex()}, {self.duration_s * 1e6:.0f}us)"
+
+
+class FakeI2CBus:
+    def __init__(self, clock_hz=400_000, simulate_timing=False, max_log=100_000):
+        self.clock_hz = clock_hz
+        self.simulate_timing = simulate_timing
+        self.log = deque(maxlen=max_log)
+        self.transactions = 0
+        self.bytes = 0
+        self.bus_time_s = 0.0
+        self._lock = threading.Lock()
+
+    def transaction_time(self, nbytes: int) -> float:
+        """
+        Time a write of nbytes (register pointer included) takes on the
+        wire: START, address byte, data bytes, each byte with its ACK bit
+        (9 clocks), then STOP.
+        """
+        bits = 1 + 9 * (1 + nbytes) + 1
+        return bits / self.clock_hz
+
+    def write(self, address: int, data: bytes):
+        duration = self.transaction_time(len(data))
+        with self._lock:
+            self.log.append(I2CTransaction(time.monotonic(), address, bytes(data), duration))
+            self.transactions += 1
+            self.bytes += len(data)
+            self.bus_time_s += duration
+            if self.simulate_timing:
+                # Sleep for most of it so other buses' threads can run,
+                # then spin out the remainder for accuracy
+                end = time.perf_counter() + duration
+                if duration > SPIN_S:
+                    time.sleep(duration - SPIN_S)
+                while time.perf_counter() < end:
+                    pass
+
+    def reset_stats(self):
+        with self._lock:
+            self.log.clear()
+            self.transactions = 0
+            self.bytes = 0
+            self.bus_time_s = 0.0
+
+
+class FakePCA9685:
+    """
+    Register-level PCA9685 model. Implements the PWMController backend
+    interface (set_frequency, write) and applies writes to a 256-byte
+    register file with auto-increment, so tests can read back channels.
+    """
+
+    def __init__(self, bus=None, address=0x40):
+        self.bus = bus if bus is not None else FakeI2CBus()
+        self.address = address
+        self.registers = bytearray(256)
+
+    def write(self, register: int, data: bytes):
+        self.bus.write(self.address, bytes([register]) + data)
+        auto_increment = self.registers[MODE1] & MODE1_AI
+        for i, value in enumerate(data):
+            reg = register + i if auto_increment else register
+            self.registers[reg & 0xFF] = value
+
+    def set_frequency(self, frequency: float) -> float:
+        # Same register sequence adafruit_pca9685 uses
+        prescale = int(OSC_HZ / 4096 / frequency + 0.5) - 1
+        old_mode = self.registers[MODE1]
+        self.write(MODE1, bytes([(old_mode & 0x7F) | MODE1_SLEEP]))
+        self.write(PRESCALE, bytes([prescale]))
+        self.write(MODE1, bytes([old_mode]))
+        self.write(MODE1, bytes([old_mode | MODE1_RESTART | MODE1_AI]))
+        return OSC_HZ / 4096 / (self.registers[PRESCALE] + 1)
+
+    def channel_counts(self, channel: int):
+        """(ON, OFF) counts currently programmed for a channel."""
+        base = LED0_ON_L + 4 * channel
+        regs = self.registers[base:base + 4]
+        return regs[0] | regs[1] << 8, regs[2] | regs[3] << 8
+
+    def channel_pulse_us(self, channel: int) -> float:
+        on, off = self.channel_counts(channel)
+        frequency = OSC_HZ / 4096 / (self.registers[PRESCALE] + 1)
+        if on & 0x1000:
+            return 1_000_000 / frequency
+        return ((off - on) % 4096) / 4096 * 1_000_000 / frequency
@@ -0,0 +1,43 @@
+def open_i2c_bus(bus=1):
+    """
+    Open an I2C bus by its /dev/i2c-N number. Bus 1 is the Pi's SDA/SCL
+    header pins; others (e.g. added with dtoverlay=i2c-gpio) go through
+    adafruit_extended_bus.
+    """
+    if bus == 1:
+        import busio
+        from board import SCL, SDA
+        return busio.I2C(SCL, SDA)
+
+    from adafruit_extended_bus import ExtendedI2C
+    return ExtendedI2C(bus)
+
+
+class AdafruitPCA9685Backend:
+    """
+    Real PCA9685 on the Pi's I2C bus via adafruit_pca9685.
+
+    The Blinka/Adafruit modules are only imported when this backend is
+    created, so the rest of the actuator code can be imported (and run
+    against FakePCA9685) on machines without them.
+
+    Backends expose two methods used by PWMController:
+        set_frequency(hz) -> actual frequency after prescale rounding
+        write(register, data) -> one I2C write starting at register
+    """
+
+    def __init__(self, address=0x40, i2c=None):
+        """i2c is an open bus shared with other boards on it; defaults to bus 1."""
+        from adafruit_pca9685 import PCA9685
+
+        self.i2c = i2c if i2c is not None else open_i2c_bus()
+        self.pca = PCA9685(self.i2c, address=address)
+
+    def set_frequency(self, frequency: float) -> float:
+        # Also enables register auto-increment (MODE1.AI)
+        self.pca.frequency = frequency
+        return self.pca.frequency
+
+    def write(self, register: int, data: bytes):
+        with self.pca.i2c_device as i2c:
+            i2c.write(bytes([register]) + data)
@@ -0,0 +1,188 @@
+"""
+Several PCA9685 boards across one or more I2C buses.
+
+Each bus gets a worker thread that owns every write to the boards on it.
+The runtime hands over a whole frame with write() and returns at once;
+boards on the same bus are written one after another (the bus is serial
+anyway), while separate buses are written in parallel. Adding boards on
+another bus therefore doesn't lengthen the frame, and the tick loop never
+waits on I2C.
+"""
+import logging
+import threading
+
+from .pwm_controller import PWMController
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BOARD = "main"
+
+
+class BusWorker:
+    """
+    Writes frames for the boards on one I2C bus from a dedicated thread.
+
+    Frames are latest-wins: if a new frame arrives while the previous one
+    is still being written, it is merged into the pending one per channel,
+    so the worker always catches up to the newest duties instead of
+    queueing behind old ones.
+    """
+
+    def __init__(self, bus_id):
+        self.bus_id = bus_id
+        self.frames = 0
+        self.merged = 0
+        self.errors = 0
+
+        self._pending = {}
+        self._busy = False
+        self._closing = False
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(
+            target=self._run, name=f"pwm-bus-{bus_id}", daemon=True
+        )
+        self._thread.start()
+
+    def submit(self, frames: dict):
+        """Queue {PWMController: {channel: duty}} for writing."""
+        with self._cond:
+            if self._pending:
+                self.merged += 1
+            for pwm, duties in frames.items():
+                self._pending.setdefault(pwm, {}).update(duties)
+            self._cond.notify()
+
+    def flush(self, timeout=None) -> bool:
+        """Wait until everything submitted so far has been written."""
+        with self._cond:
+            return self._cond.wait_for(
+                lambda: not self._pending and not self._busy, timeout
+            )
+
+    def close(self):
+        """Write whatever is pending, then stop the thread."""
+        with self._cond:
+            self._closing = True
+            self._cond.notify()
+        self._thread.join(timeout=1.0)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending or self._closing)
+                if not self._pending:
+                    return
+                frames, self._pending = self._pending, {}
+                self._busy = True
+
+            try:
+                for pwm, duties in frames.items():
+                    pwm.set_duties(duties)
+            except Exception as e:
+                # Nothing may kill the writer, or the bus goes silently dead.
+                # set_duties forgets the shadow of channels that failed, so
+                # the next frame rewrites them even if their duty is unchanged
+                self.errors += 1
+                if isinstance(e, OSError):
+                    logger.error(f"I2C bus {self.bus_id} write failed: {e}")
+                else:
+                    logger.exception(f"I2C bus {self.bus_id} writer error")
+            finally:
+                with self._cond:
+                    self._busy = False
+                    self.frames += 1
+                    self._cond.notify_all()
+
+
+class PWMBusManager:
+    """Named PCA9685 boards grouped by the I2C bus they sit on."""
+
+    def __init__(self):
+        self.boards = {}
+        self.workers = {}
+        self._bus_of = {}
+
+    def add_board(self, name, pwm: PWMController, bus_id=1):
+        if name in self.boards:
+            raise ValueError(f"Duplicate PWM board: {name}")
+        self.boards[name] = pwm
+        if bus_id not in self.workers:
+            self.workers[bus_id] = BusWorker(bus_id)
+        self._bus_of[pwm] = self.workers[bus_id]
+
+    def board(self, name=None) -> PWMController:
+        """Look up a board by name; None means the first board configured."""
+        if name is None:
+            return next(iter(self.boards.values()))
+        if name not in self.boards:
+            raise ValueError(f"Unknown PWM board: {name}")
+        return self.boards[name]
+
+    def write(self, frames: dict):
+        """Hand {PWMController: {channel: duty}} to the bus workers without waiting."""
+        per_bus = {}
+        for pwm, duties in frames.items():
+            per_bus.setdefault(self._bus_of[pwm], {})[pwm] = duties
+        for worker, bus_frames in per_bus.items():
+            worker.submit(bus_frames)
+
+    def flush(self, timeout=None) -> bool:
+        """Wait until every bus has written all submitted frames."""
+        return all(worker.flush(timeout) for worker in self.workers.values())
+
+    def close(self):
+        for worker in self.workers.values():
+            worker.close()
+
+
+def create_pwm_boards(cfg: dict) -> PWMBusManager:
+    """
+    Build the boards described by actuators.yaml.
+
+    pwm_controllers lists boards with name, bus (/dev/i2c-N, default 1),
+    address and frequency. A single pwm_controller section is still
+    accepted and becomes the board "main". backend: "fake" simulates the
+    chip and its bus in memory, at bus_hz (default 400 kHz).
+    """
+    if "pwm_controllers" in cfg:
+        entries = cfg["pwm_controllers"]
+    else:
+        entries = [dict(cfg["pwm_controller"], name=DEFAULT_BOARD)]
+
+    manager = PWMBusManager()
+    buses = {}
+    for entry in entries:
+        bus_id = entry.get("bus", 1)
+        kind = entry.get("backend", "pca9685")
+        # Boards on the same bus share one bus object (and its lock)
+        key = (kind, bus_id)
+        if key not in buses:
+            buses[key] = _open_bus(kind, bus_id, entry)
+
+        if kind == "fake":
+            from .fake_pca9685 import FakePCA9685
+            backend = FakePCA9685(buses[key], address=entry["address"])
+        else:
+            from .pca9685_backend import AdafruitPCA9685Backend
+            backend = AdafruitPCA9685Backend(address=entry["address"], i2c=buses[key])
+
+        pwm = PWMController(
+            frequency=entry.get("frequency", 50),
+            address=entry["address"],
+            backend=backend,
+        )
+        manager.add_board(entry["name"], pwm, bus_id)
+    return manager
+
+
+def _open_bus(kind, bus_id, entry):
+    if kind == "fake":
+        from .fake_pca9685 import FakeI2CBus
+        return FakeI2CBus(
+            clock_hz=entry.get("bus_hz", 400_000),
+            simulate_timing=entry.get("simulate_timing", True),
+        )
+    if kind == "pca9685":
+        from .pca9685_backend import open_i2c_bus
+        return open_i2c_bus(bus_id)
+    raise ValueError(f"Unknown PWM backend: {kind}")
@@ -1,14 +1,103 @@
-import busio
-from board import SCL, SDA
-from adafruit_pca9685 import PCA9685
+import struct
+
+# PCA9685 registers: each channel has ON_L, ON_H, OFF_L, OFF_H starting at LED0_ON_L
+LED0_ON_L = 0x06
+REGS_PER_CHANNEL = 4
+NUM_CHANNELS = 16
+FULL_ON = 0x1000
+MAX_DUTY = 0xFFFF
+
+
+def duty_to_regs(duty: int):
+    """Convert a 16-bit duty cycle to (ON, OFF) counts, like adafruit_pca9685."""
+    if duty >= MAX_DUTY:
+        return FULL_ON, 0
+    return 0, (duty + 1) >> 4
+
 
 class PWMController:
-    def __init__(self, frequency=50, address=0x40):
-        self.i2c = busio.I2C(SCL, SDA)
-        self.pca = PCA9685(self.i2c, address=address)
-        self.pca.frequency = frequency
+    def __init__(self, frequency=50, address=0x40, backend=None):
+        """
+        backend talks to the chip (see AdafruitPCA9685Backend); defaults to
+        the real PCA9685 at address. Pass a FakePCA9685 to run without hardware.
+        """
+        if backend is None:
+            from .pca9685_backend import AdafruitPCA9685Backend
+            backend = AdafruitPCA9685Backend(address=address)
+        self.backend = backend
+        # Setting the frequency also enables register auto-increment (MODE1.AI),
+        # which the burst writes in set_many rely on. The actual frequency is
+        # cached since reading it back from the chip costs I2C traffic.
+        self.period_us = 1_000_000 / self.backend.set_frequency(frequency)
+        # Shadow of the duty last written to each channel (None = unknown)
+        self._duty = [None] * NUM_CHANNELS
+
+    def duty_for_pulse(self, pulse_us: float) -> int:
+        duty = int((pulse_us / self.period_us) * 65535)
+        return max(0, min(MAX_DUTY, duty))
 
     def set_pulse_us(self, channel: int, pulse_us: float):
-        period_us = 1_000_000 / self.pca.frequency
-        duty = int((pulse_us / period_us) * 65535)
-        self.pca.channels[channel].duty_cycle = duty
+        self.set_many({channel: pulse_us})
+
+    def set_many(self, pulses: dict) -> int:
+        """
+        Set several channels at once from {channel: pulse_us}.
+
+        Channels whose duty has not changed are skipped and the rest are
+        written with as few auto-increment I2C bursts as possible (one if
+        the channels are contiguous or only separated by channels that have
+        been written before). Returns the number of channels that changed.
+        """
+        return self.set_duties({
+            channel: self.duty_for_pulse(pulse_us)
+            for channel, pulse_us in pulses.items()
+        })
+
+    def set_duties(self, duties: dict) -> int:
+        """Like set_many, but with precomputed 16-bit duty cycles."""
+        dirty = [
+            channel for channel, duty in duties.items()
+            if self._duty[channel] != duty
+        ]
+        if not dirty:
+            return 0
+
+        for channel in dirty:
+            self._duty[channel] = duties[channel]
+        bursts = list(self._bursts(sorted(dirty)))
+        for i, (first, last) in enumerate(bursts):
+            try:
+                self._write_channels(first, last)
+            except Exception:
+                # What reached the chip is unknown now; forget the shadow of
+                # everything not confirmed written so the next frame resends it
+                for first, last in bursts[i:]:
+                    for channel in range(first, last + 1):
+                        self._duty[channel] = None
+                raise
+        return len(dirty)
+
+    def _bursts(self, channels):
+        """
+        Group sorted dirty channels into (first, last) ranges for burst writes.
+        Gaps are bridged when every channel in the gap has a known shadow
+        value, since rewriting it with the same duty is harmless.
+        """
+        first = last = channels[0]
+        for channel in channels[1:]:
+            gap = range(last + 1, channel)
+            if all(self._duty[c] is not None for c in gap):
+                last = channel
+            else:
+                yield first, last
+                first = last = channel
+        yield first, last
+
+    def _write_channels(self, first: int, last: int):
+        count = last - first + 1
+        buf = bytearray(count * REGS_PER_CHANNEL)
+        for i in range(count):
+            on, off = duty_to_regs(self._duty[first + i])
+            struct.pack_into("<HH", buf, i * REGS_PER_CHANNEL, on, off)
+        self.backend.write(LED0_ON_L + first * REGS_PER_CHANNEL, bytes(buf))
+
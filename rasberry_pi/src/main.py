@@ -0,0 +1,107 @@
+"""
+Actuator runtime service.
+
+Loads src/config/actuators.yaml, listens for topside commands and drives
+the servos and ESCs through the PCA9685. Run from the rasberry_pi
+directory with:
+
+    python -m src.main
+"""
+import logging
+import signal
+
+import yaml
+
+from src.drivers.pwm_bus import create_pwm_boards
+from src.actuators.servo import Servo
+from src.actuators.esc_motor import ESCMotor
+from src.comms.command_server import CommandServer
+from src.comms.udp_server import UdpCommandServer
+from src.runtime.actuator_runtime import ActuatorRuntime, enable_realtime
+
+CONFIG = "src/config/actuators.yaml"
+
+logger = logging.getLogger(__name__)
+
+
+def build_actuators(cfg, boards):
+    used = set()
+    for a in cfg["servos"] + cfg["motors"]:
+        # Resolve the board first: no board means the default one, which
+        # may also be named explicitly
+        key = (boards.board(a.get("board")), a["channel"])
+        if key in used:
+            raise ValueError(f"{a['name']}: channel {a['channel']} is already in use")
+        used.add(key)
+
+    servos = {
+        s["id"]: Servo(boards.board(s.get("board")), s["channel"], max_speed=s.get("max_speed"))
+        for s in cfg["servos"]
+    }
+    motors = {
+        m["id"]: ESCMotor(
+            boards.board(m.get("board")), m["channel"],
+            max_rate=m.get("max_rate"),
+            max_accel=m.get("max_accel"),
+        )
+        for m in cfg["motors"]
+    }
+    return servos, motors
+
+
+def main():
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+
+    with open(CONFIG) as f:
+        cfg = yaml.safe_load(f)
+
+    boards = create_pwm_boards(cfg)
+    servos, motors = build_actuators(cfg, boards)
+
+    runtime_cfg = cfg.get("runtime", {})
+    if "realtime_priority" in runtime_cfg:
+        enable_realtime(runtime_cfg["realtime_priority"])
+
+    runtime = ActuatorRuntime(
+        boards,
+        servos,
+        motors,
+        rate_hz=runtime_cfg.get("rate_hz", 50),
+        watchdog_timeout=runtime_cfg.get("watchdog_timeout", 0.5),
+    )
+
+    # The same port number serves TCP (line stream) and UDP (datagrams)
+    listen_cfg = runtime_cfg.get("listen", {})
+    host = listen_cfg.get("host", "0.0.0.0")
+    port = listen_cfg.get("port", 5005)
+    servers = [
+        CommandServer(runtime.handle, host=host, port=port),
+        UdpCommandServer(runtime.handle, host=host, port=port),
+    ]
+
+    # systemd stops the service with SIGTERM
+    signal.signal(signal.SIGTERM, lambda *_: runtime.stop())
+
+    for server in servers:
+        server.start()
+    logger.info(
+        f"Driving {len(servos)} servos and {len(motors)} motors on "
+        f"{len(boards.boards)} boards across {len(boards.workers)} I2C buses"
+    )
+    try:
+        runtime.run()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for server in servers:
+            server.close()
+        runtime.neutralize()
+        boards.close()
+        logger.info("Shutdown complete")
+
+
+if __name__ == "__main__":
+    main()
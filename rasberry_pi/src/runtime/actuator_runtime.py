@@ -0,0 +1,158 @@
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+STATUS_HEADER = "=== Device Status ==="
+STATUS_FOOTER = "===================="
+
+
+class ActuatorRuntime:
+    """
+    Applies topside commands to the actuators on a fixed-rate loop.
+
+    Commands only set actuator targets. Every tick each actuator moves
+    toward its target under its own motion limits (servo move time and
+    speed, ESC rate/acceleration), and the resulting duties are handed to
+    the PWMBusManager as one frame per board; the bus workers write them
+    in the background, skipping unchanged channels. Actuators advance by
+    the measured time since the previous tick, so overruns don't slow
+    their motion down.
+
+    STOP_ALL and the watchdog (no command for watchdog_timeout seconds)
+    put every ESC at neutral at once, bypassing the throttle ramp, until
+    the topside talks again. Servos hold their position.
+    """
+
+    def __init__(self, boards, servos: dict, motors: dict, rate_hz=50, watchdog_timeout=0.5):
+        self.boards = boards
+        self.servos = servos
+        self.motors = motors
+        self.period = 1.0 / rate_hz
+        self.watchdog_timeout = watchdog_timeout
+
+        # Actuator targets are only touched under _lock
+        self.actuators = list(servos.values()) + list(motors.values())
+        self._by_board = {}
+        for actuator in self.actuators:
+            self._by_board.setdefault(actuator.pwm, []).append(actuator)
+        self._lock = threading.Lock()
+        self._last_command = time.monotonic()
+        self._last_tick = None
+        self._watchdog_tripped = False
+        self._stop = threading.Event()
+
+        self.ticks = 0
+        self.overruns = 0
+
+    def handle(self, command) -> list:
+        """Apply a parsed Command. Returns the reply lines for the sender."""
+        with self._lock:
+            self._last_command = time.monotonic()
+
+            if command.kind == "STATUS":
+                return self._status_lines()
+            if command.kind == "STOP_ALL":
+                # Emergency stop: no ramp
+                for motor in self.motors.values():
+                    motor.jump_to(0.0)
+                return []
+
+            devices = self.servos if command.kind == "SERVO" else self.motors
+            actuator = devices.get(command.device_id)
+            if actuator is None:
+                return [f"ERROR: Unknown {command.kind} {command.device_id}"]
+
+            # The topside sends servo angles and motor speeds in [-100, 100]
+            if command.kind == "SERVO":
+                actuator.set_target(
+                    command.params["angle"] / 100,
+                    command.params.get("time", 0),
+                )
+            else:
+                actuator.set_target(command.params["speed"] / 100)
+            return []
+
+    def _status_lines(self):
+        lines = [STATUS_HEADER]
+        for kind, devices in (("SERVO", self.servos), ("MOTOR", self.motors)):
+            for device_id, actuator in devices.items():
+                lines.append(
+                    f"  {kind} {device_id} ch{actuator.channel}: "
+                    f"{actuator.value:+.2f} -> {actuator.target:+.2f}"
+                )
+        lines.append(
+            f"  ticks={self.ticks} overruns={self.overruns} "
+            f"watchdog={'tripped' if self._watchdog_tripped else 'ok'}"
+        )
+        for worker in self.boards.workers.values():
+            lines.append(
+                f"  i2c-{worker.bus_id}: frames={worker.frames} "
+                f"merged={worker.merged} errors={worker.errors}"
+            )
+        lines.append(STATUS_FOOTER)
+        return lines
+
+    def tick(self):
+        """Check the watchdog, advance every actuator and hand one frame per board to the bus workers."""
+        now = time.monotonic()
+        dt = self.period if self._last_tick is None else now - self._last_tick
+        self._last_tick = now
+        with self._lock:
+            silent = now - self._last_command
+            if silent > self.watchdog_timeout:
+                if not self._watchdog_tripped:
+                    logger.warning(f"No commands for {silent:.2f}s, neutralizing ESCs")
+                    self._watchdog_tripped = True
+                for motor in self.motors.values():
+                    motor.jump_to(0.0)
+            elif self._watchdog_tripped:
+                logger.info("Commands resumed")
+                self._watchdog_tripped = False
+
+            frames = {
+                pwm: {a.channel: a.duty(a.update(dt)) for a in actuators}
+                for pwm, actuators in self._by_board.items()
+            }
+
+        self.boards.write(frames)
+        self.ticks += 1
+
+    def run(self):
+        """Run the tick loop on absolute deadlines until stop() is called."""
+        next_deadline = time.monotonic()
+        while not self._stop.is_set():
+            self.tick()
+
+            next_deadline += self.period
+            delay = next_deadline - time.monotonic()
+            if delay > 0:
+                self._stop.wait(delay)
+            else:
+                # Missed the deadline; skip the lost ticks instead of bursting
+                self.overruns += 1
+                next_deadline = time.monotonic()
+
+    def stop(self):
+        self._stop.set()
+
+    def neutralize(self):
+        """Immediately return every ESC to neutral, bypassing the ramp, and wait for the write."""
+        with self._lock:
+            frames = {}
+            for motor in self.motors.values():
+                motor.jump_to(0.0)
+                frames.setdefault(motor.pwm, {})[motor.channel] = motor.duty(0.0)
+        self.boards.write(frames)
+        self.boards.flush(timeout=1.0)
+
+
+def enable_realtime(priority: int):
+    """Try to run the calling process with SCHED_FIFO priority (needs CAP_SYS_NICE)."""
+    try:
+        os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(priority))
+        logger.info(f"Running with SCHED_FIFO priority {priority}")
+    except (AttributeError, PermissionError, OSError) as e:
+        logger.warning(f"Could not enable real-time scheduling: {e}")
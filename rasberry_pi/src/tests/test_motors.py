@@ -1,7 +1,7 @@
 import time
 import yaml
 
-from src.drivers.pwm_controller import PWMController
+from src.drivers.pwm_bus import create_pwm_boards
 from src.actuators.servo import Servo
 from src.actuators.esc_motor import ESCMotor
 
@@ -11,26 +11,24 @@ def main():
     with open(CONFIG) as f:
         cfg = yaml.safe_load(f)
 
-    pwm_cfg = cfg["pwm_controller"]
-    pwm = PWMController(
-        frequency=pwm_cfg["frequency"],
-        address=pwm_cfg["address"]
-    )
+    boards = create_pwm_boards(cfg)
 
     servos = []
     motors = []
 
     for s in cfg["servos"]:
-        servos.append(Servo(pwm, s["channel"]))
+        servos.append(Servo(boards.board(s.get("board")), s["channel"]))
 
     for m in cfg["motors"]:
-        motors.append(ESCMotor(pwm, m["channel"]))
+        motors.append(ESCMotor(boards.board(m.get("board")), m["channel"]))
 
     print("Centering servos, neutral motors...")
-    for s in servos:
-        s.set(0.0)
-    for m in motors:
-        m.set(0.0)
+    # One batched write per board, all buses in parallel
+    frames = {}
+    for a in servos + motors:
+        frames.setdefault(a.pwm, {})[a.channel] = a.duty(0.0)
+    boards.write(frames)
+    boards.flush()
 
     time.sleep(3)
 
@@ -44,5 +42,7 @@ def main():
     for m in motors:
         m.set(0.0)
 
+    boards.close()
+
 if __name__ == "__main__":
     main()
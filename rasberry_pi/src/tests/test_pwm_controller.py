@@ -0,0 +1,90 @@
+"""Off-hardware checks of the PWMController shadow and burst writes."""
+import pytest
+
+from src.drivers.fake_pca9685 import LED0_ON_L, FakePCA9685
+from src.drivers.pwm_controller import PWMController, duty_to_regs
+
+
+def make_controller(backend=None):
+    backend = backend or FakePCA9685()
+    pwm = PWMController(backend=backend)
+    backend.bus.reset_stats()
+    return pwm, backend
+
+
+def writes(backend):
+    """(first channel, channel count) of every burst written to the chip."""
+    return [
+        ((t.data[0] - LED0_ON_L) // 4, (len(t.data) - 1) // 4)
+        for t in backend.bus.log
+    ]
+
+
+def test_writes_reach_the_registers():
+    pwm, chip = make_controller()
+    assert pwm.set_duties({0: 0x1000, 3: 0x8000, 15: 0xFFFF}) == 3
+    for channel, duty in ((0, 0x1000), (3, 0x8000), (15, 0xFFFF)):
+        assert chip.channel_counts(channel) == duty_to_regs(duty)
+
+
+def test_unchanged_duties_are_skipped():
+    pwm, chip = make_controller()
+    pwm.set_duties({0: 100, 1: 200})
+    chip.bus.reset_stats()
+    assert pwm.set_duties({0: 100, 1: 200}) == 0
+    assert pwm.set_duties({0: 100, 1: 300}) == 1
+    assert writes(chip) == [(1, 1)]
+
+
+def test_contiguous_channels_share_one_burst():
+    pwm, chip = make_controller()
+    pwm.set_duties({2: 1, 3: 2, 4: 3})
+    assert writes(chip) == [(2, 3)]
+
+
+def test_unknown_gaps_split_bursts():
+    pwm, chip = make_controller()
+    pwm.set_duties({0: 1, 5: 2})
+    assert writes(chip) == [(0, 1), (5, 1)]
+
+
+def test_known_gaps_are_bridged():
+    pwm, chip = make_controller()
+    pwm.set_duties({c: 10 for c in range(6)})
+    chip.bus.reset_stats()
+    pwm.set_duties({0: 20, 5: 20})
+    assert writes(chip) == [(0, 6)]
+    # The bridged channels were rewritten with their old duty
+    assert chip.channel_counts(2) == duty_to_regs(10)
+
+
+class FlakyChip(FakePCA9685):
+    """Raises on the given write calls (counted from 1)."""
+
+    def __init__(self, fail_on):
+        super().__init__()
+        self.fail_on = set(fail_on)
+        self.calls = 0
+
+    def write(self, register, data):
+        self.calls += 1
+        if self.calls in self.fail_on:
+            raise OSError("I2C NACK")
+        super().write(register, data)
+
+
+def test_failed_burst_is_resent_next_frame():
+    chip = FlakyChip(fail_on=set())
+    pwm, _ = make_controller(chip)
+    chip.fail_on = {chip.calls + 2}
+
+    # First burst (0) lands, second (5) fails; only 5 is left unknown
+    with pytest.raises(OSError):
+        pwm.set_duties({0: 1, 5: 2})
+    assert pwm._duty[0] == 1
+    assert pwm._duty[5] is None
+
+    chip.bus.reset_stats()
+    assert pwm.set_duties({0: 1, 5: 2}) == 1
+    assert writes(chip) == [(5, 1)]
+    assert chip.channel_counts(5) == duty_to_regs(2)
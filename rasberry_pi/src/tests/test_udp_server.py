@@ -0,0 +1,37 @@
+"""Checks of the Pi-side datagram sequencing."""
+from src.comms.udp_server import SequenceTracker
+
+
+def test_in_order_datagrams_are_accepted():
+    tracker = SequenceTracker()
+    assert [tracker.accept(seq) for seq in (1, 2, 3)] == [True, True, True]
+    assert (tracker.received, tracker.lost, tracker.reordered, tracker.duplicates) == (3, 0, 0, 0)
+
+
+def test_late_arrival_is_reordered_not_lost():
+    tracker = SequenceTracker()
+    tracker.accept(1)
+    assert tracker.accept(4)
+    assert tracker.lost == 2
+    assert not tracker.accept(3)
+    assert (tracker.lost, tracker.reordered) == (1, 1)
+
+
+def test_redundant_copies_are_duplicates():
+    tracker = SequenceTracker()
+    tracker.accept(2)
+    tracker.accept(3)
+    assert not tracker.accept(3)
+    assert not tracker.accept(2)
+    assert (tracker.duplicates, tracker.reordered, tracker.lost) == (2, 0, 0)
+
+
+def test_sender_restart_resynchronizes():
+    tracker = SequenceTracker()
+    for seq in range(1, 501):
+        tracker.accept(seq)
+    assert tracker.accept(1)
+    assert tracker.highest == 1
+
+    tracker.accept(5000)
+    assert tracker.accept(5000 - SequenceTracker.RESTART_GAP - 1)
@@ -0,0 +1,73 @@
+import numpy as np
+
+class PID:
+    def __init__(self, kp, ki, kd, limit, windup_limit=5):
+        self.kp, self.ki, self.kd = kp, ki, kd
+        self.limit = limit
+        self.windup_limit = windup_limit
+        self.integral = 0
+        self.prev_error = 0
+
+    def compute(self, target, current, dt):
+        error = target - current
+        self.integral = np.clip(self.integral + error * dt, -self.windup_limit, self.windup_limit)
+        derivative = (error - self.prev_error) / dt
+        
+        output = (self.kp * error) + (self.ki * self.integral) + (self.kd * derivative)
+        self.prev_error = error
+        return np.clip(output, -self.limit, self.limit)
+
+class BallastSystem:
+    def __init__(self, initial_buoyancy, dt):
+        self.buoyancy = initial_buoyancy
+        self.actual_flow_rate = 0.0
+        self.dt = dt
+        # Physics Parameters
+        self.deadzone = 1.2
+        self.motor_inertia = 0.15
+        self.max_pump_power = 10.0
+        self.u_after_deadzone = 0.0
+
+    def update(self, pump_command):
+        # Apply Deadzone
+        self.u_after_deadzone = pump_command if abs(pump_command) > self.deadzone else 0.0
+        # Apply Motor Inertia
+        self.actual_flow_rate = (self.u_after_deadzone * self.motor_inertia) + (self.actual_flow_rate * (1 - self.motor_inertia))
+        # Update physical buoyancy
+        self.buoyancy += self.actual_flow_rate * self.dt
+        return self.buoyancy
+
+class Submarine:
+    def __init__(self, mass, drag_coeff):
+        self.mass = mass
+        self.drag_coeff = drag_coeff
+        self.weight = mass * 9.81
+        self.depth = 0.0
+        self.velocity = 0.0
+
+    def update(self, current_buoyancy, dt):
+        drag_force = self.drag_coeff * self.velocity
+        # Net force = Gravity - Buoyancy - Drag
+        net_force = self.weight - current_buoyancy - drag_force
+        
+        acceleration = net_force / self.mass
+        self.velocity += acceleration * dt
+        self.depth += self.velocity * dt
+        return self.depth
+
+# Channels recorded per simulation step (also the names used in SIL telemetry)
+HISTORY_KEYS = ['time', 'depth', 'target_depth', 'buoyancy', 'target_buoyancy', 'pump_cmd', 'actual_flow_rate', 'pump_active']
+
+class DepthAutopilot:
+    # Outer Loop: Depth -> Target Buoyancy Offset
+    # Inner Loop: Buoyancy Error -> Pump Power
+    def __init__(self, max_pump_power):
+        self.depth_pid = PID(kp=0.06, ki=0.1, kd=7.5, limit=20.0)
+        self.buoyancy_pid = PID(kp=1.25, ki=0.1025, kd=0.0125, limit=max_pump_power)
+
+    def compute(self, target_depth, sub, ballast, dt):
+        # The depth PID output is the "Desired Buoyancy Offset" from neutral
+        buoyancy_offset_cmd = self.depth_pid.compute(target_depth, sub.depth, dt)
+        target_buoyancy = sub.weight - buoyancy_offset_cmd
+        pump_cmd = self.buoyancy_pid.compute(target_buoyancy, ballast.buoyancy, dt)
+        return target_buoyancy, pump_cmd
@@ -0,0 +1,60 @@
+"""
+Plot a telemetry recording exported with
+
+    python -m joystick.telemetry.export <recording> -o dive.json
+
+Recordings of SIL runs carry the simulation history channels and are drawn
+with the same figure as main.py; anything else gets one subplot per channel.
+
+    python plot_recording.py dive.json -o dive.png
+"""
+import argparse
+import json
+
+import matplotlib.pyplot as plt
+
+from main import plot_history
+
+HISTORY_PLOT_KEYS = ['depth', 'target_depth', 'buoyancy', 'target_buoyancy', 'pump_active']
+
+
+def plot_channels(history, path, channels=None):
+    channels = channels or [key for key in history if key != 'time']
+    fig, axes = plt.subplots(len(channels), 1, figsize=(10, 2.5 * len(channels)), sharex=True, squeeze=False)
+
+    for ax, channel in zip(axes[:, 0], channels):
+        # null (before a channel's first sample) plots as a gap
+        values = [float('nan') if v is None else v for v in history[channel]]
+        ax.plot(history['time'], values, label=channel)
+        ax.set_ylabel(channel)
+        ax.grid(True)
+    axes[-1, 0].set_xlabel("Time (s)")
+
+    plt.tight_layout()
+    plt.savefig(path)
+    plt.close(fig)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Plot an exported telemetry recording")
+    parser.add_argument('history', help="JSON file written by joystick.telemetry.export")
+    parser.add_argument('-o', '--output', default="recording.png")
+    parser.add_argument('-c', '--channels', help="comma-separated channels to plot (default: all)")
+    args = parser.parse_args()
+
+    with open(args.history) as f:
+        history = json.load(f)
+
+    if args.channels is None and all(key in history for key in HISTORY_PLOT_KEYS):
+        history = {
+            key: [float('nan') if v is None else v for v in values]
+            for key, values in history.items()
+        }
+        plot_history(history, args.output)
+    else:
+        plot_channels(history, args.output, args.channels.split(',') if args.channels else None)
+    print(f"Saved {args.output}")
+
+
+if __name__ == '__main__':
+    main()
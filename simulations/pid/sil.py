@@ -0,0 +1,382 @@
+"""
+Software-in-the-loop plant: stands in for the actuator runtime so the
+topside controller drives the submarine model instead of hardware.
+
+    python sil.py --port 5005
+
+and point the joystick controller at it with serial.transport: udp and
+serial.udp.host: 127.0.0.1. Commands use the runtime's UDP protocol
+("#<seq>" header line, then SERVO/MOTOR/STATUS/STOP_ALL lines):
+
+    MOTOR <pump-motor> speed s   manual pump power, s in [-100, 100]
+    SERVO <depth-servo> angle a  depth setpoint for the autopilot,
+                                 a in [-100, 100] -> [0, max depth]
+
+The plant steps at a fixed rate and streams TELEM lines with the
+history channels of main.py back to the sender, and to any --telem-to
+address (e.g. the live dashboard). --latency delays every
+command before it reaches the plant. On exit it prints stability
+metrics and can plot the run with main.plot_history.
+
+    python sil.py --sweep 0,100,200,400,800
+
+runs the depth autopilot offline with that much delay (ms) between the
+controller and the pump, and tabulates how stability degrades.
+"""
+import argparse
+import collections
+import logging
+import socket
+import time
+
+from model import HISTORY_KEYS, BallastSystem, DepthAutopilot, Submarine
+
+logger = logging.getLogger("sil")
+
+MAX_DATAGRAM = 65507
+STATUS_HEADER = "=== Device Status ==="
+STATUS_FOOTER = "===================="
+
+
+class Plant:
+    """
+    Submarine and ballast stepped at a fixed dt, driven either by a
+    manual pump command or by the depth autopilot.
+
+    latency_steps delays the autopilot's pump command by that many steps
+    (a pure delay inside the control loop).
+    """
+
+    def __init__(self, dt=0.05, latency_steps=0):
+        self.dt = dt
+        self.sub = Submarine(mass=15.0, drag_coeff=0.5)
+        self.ballast = BallastSystem(initial_buoyancy=self.sub.weight, dt=dt)
+        self.autopilot = DepthAutopilot(self.ballast.max_pump_power)
+
+        self.time = 0.0
+        self.autopilot_on = False
+        self.target_depth = 0.0
+        self.manual_pump = 0.0
+        self.history = {key: [] for key in HISTORY_KEYS}
+        self._delay = collections.deque([0.0] * latency_steps)
+
+    def set_pump(self, power):
+        self.autopilot_on = False
+        self.manual_pump = max(-1.0, min(1.0, power)) * self.ballast.max_pump_power
+
+    def set_target_depth(self, depth):
+        self.autopilot_on = True
+        self.target_depth = depth
+
+    def step(self):
+        if self.autopilot_on:
+            target_buoyancy, pump_cmd = self.autopilot.compute(
+                self.target_depth, self.sub, self.ballast, self.dt
+            )
+        else:
+            target_buoyancy, pump_cmd = self.ballast.buoyancy, self.manual_pump
+
+        self._delay.append(pump_cmd)
+        current_b = self.ballast.update(self._delay.popleft())
+        current_d = self.sub.update(current_b, self.dt)
+
+        sample = {
+            'time': self.time,
+            'depth': current_d,
+            'target_depth': self.target_depth if self.autopilot_on else float('nan'),
+            'buoyancy': current_b,
+            'target_buoyancy': target_buoyancy,
+            'pump_cmd': pump_cmd,
+            'actual_flow_rate': self.ballast.actual_flow_rate,
+            'pump_active': self.ballast.u_after_deadzone,
+        }
+        for key in HISTORY_KEYS:
+            self.history[key].append(float(sample[key]))
+        self.time += self.dt
+        return sample
+
+
+def stability_metrics(history, band=0.05):
+    """
+    Step-response metrics of depth against the last setpoint in history:
+    overshoot (m), settling time (s, last entry into +/- band as a
+    fraction of the step; NaN if it never settles), steady
+    state error (mean |error| over the last 10%), IAE and the number of
+    times the error changed sign (oscillations).
+    """
+    targets = history['target_depth']
+    target = targets[-1] if targets else float('nan')
+    if target != target:  # NaN: under manual control
+        return None
+    start = len(targets) - 1
+    while start > 0 and targets[start - 1] == target:
+        start -= 1
+
+    t0 = history['time'][start]
+    errors = [
+        (t - t0, target - d)
+        for t, d in zip(history['time'][start:], history['depth'][start:])
+    ]
+    dt = errors[1][0] if len(errors) > 1 else 0.0
+    direction = 1.0 if errors[0][1] >= 0 else -1.0
+    band = max(band * abs(errors[0][1]), 0.01)
+
+    overshoot = max(0.0, max(-e * direction for _, e in errors))
+    settling_time = 0.0
+    for t, e in reversed(errors):
+        if abs(e) > band:
+            settling_time = t + dt
+            break
+    if abs(errors[-1][1]) > band:
+        settling_time = float('nan')  # never settled
+
+    tail = errors[-max(1, len(errors) // 10):]
+    crossings = sum(
+        1 for (_, a), (_, b) in zip(errors, errors[1:])
+        if a * b < 0
+    )
+    return {
+        'overshoot': overshoot,
+        'settling_time': settling_time,
+        'steady_state_error': sum(abs(e) for _, e in tail) / len(tail),
+        'iae': sum(abs(e) for _, e in errors) * dt,
+        'oscillations': crossings,
+    }
+
+
+def latency_sweep(latencies_ms, target_depth=10.0, dt=0.05, sim_time=240):
+    results = []
+    for latency_ms in latencies_ms:
+        plant = Plant(dt=dt, latency_steps=round(latency_ms / 1000 / dt))
+        plant.set_target_depth(target_depth)
+        for _ in range(int(sim_time / dt)):
+            plant.step()
+        results.append((latency_ms, stability_metrics(plant.history)))
+    return results
+
+
+def parse_line(line):
+    """'SERVO,1,angle,45,time,500' -> ('SERVO', 1, {'angle': 45.0, 'time': 500.0})"""
+    parts = [p.strip() for p in line.split(',')]
+    kind = parts[0].upper()
+    if kind in ('STATUS', 'STOP_ALL'):
+        return kind, None, {}
+    if kind not in ('SERVO', 'MOTOR') or len(parts) < 2 or len(parts) % 2:
+        raise ValueError(f"Malformed command: {line}")
+    params = {parts[i].lower(): float(parts[i + 1]) for i in range(2, len(parts), 2)}
+    return kind, int(parts[1]), params
+
+
+class SilServer:
+    """
+    Fixed-rate UDP front end for a Plant.
+
+    Every tick drains pending datagrams (dropping ones older than the
+    newest seen from that sender), applies commands whose injected
+    latency has elapsed, steps the plant once and, every telem_every
+    ticks, sends a TELEM line to the last sender and to every address in
+    telem_to.
+    """
+
+    def __init__(self, plant, host='0.0.0.0', port=5005, latency=0.0,
+                 telem_rate=20.0, pump_motor=1, depth_servo=1, max_depth=20.0,
+                 telem_to=()):
+        self.plant = plant
+        self.telem_to = list(telem_to)
+        self.latency = latency
+        self.telem_every = max(1, round(1.0 / (telem_rate * plant.dt)))
+        self.pump_motor = pump_motor
+        self.depth_servo = depth_servo
+        self.max_depth = max_depth
+
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind((host, port))
+        self.sock.setblocking(False)
+
+        self.peer = None
+        self._highest = {}
+        self._tx_seq = 0
+        self._pending = collections.deque()  # (apply_at, received_at, command)
+
+        self.ticks = 0
+        self.overruns = 0
+        self.commands = 0
+        self.dropped = 0
+        # Receipt -> plant step delay of applied commands, in seconds
+        self.actuation_delays = []
+
+    def _receive(self, now):
+        while True:
+            try:
+                datagram, peer = self.sock.recvfrom(MAX_DATAGRAM)
+            except BlockingIOError:
+                return
+            lines = datagram.decode('ascii', errors='ignore').splitlines()
+            if lines and lines[0].startswith('#'):
+                try:
+                    seq = int(lines[0][1:])
+                except ValueError:
+                    continue
+                highest = self._highest.get(peer)
+                # seq 1 means the sender restarted
+                if highest is not None and seq <= highest and seq != 1:
+                    self.dropped += 1
+                    continue
+                self._highest[peer] = seq
+                lines = lines[1:]
+
+            self.peer = peer
+            replies = []
+            for line in lines:
+                if not line.strip():
+                    continue
+                try:
+                    command = parse_line(line)
+                except ValueError as e:
+                    replies.append(f"ERROR: {e}")
+                    continue
+                if command[0] == 'STATUS':
+                    # Answered at once; SerialLink waits for this on connect
+                    replies.extend(self._status_lines())
+                else:
+                    self._pending.append((now + self.latency, now, command))
+                    self.commands += 1
+            if replies:
+                self._send(replies, [peer])
+
+    def _apply(self, command):
+        kind, device_id, params = command
+        if kind == 'STOP_ALL':
+            self.plant.set_pump(0.0)
+        elif kind == 'MOTOR' and device_id == self.pump_motor:
+            self.plant.set_pump(params.get('speed', 0.0) / 100)
+        elif kind == 'SERVO' and device_id == self.depth_servo:
+            angle = max(-100.0, min(100.0, params.get('angle', 0.0)))
+            self.plant.set_target_depth((angle + 100) / 200 * self.max_depth)
+
+    def _status_lines(self):
+        p = self.plant
+        mode = f"autopilot {p.target_depth:.2f} m" if p.autopilot_on else f"manual pump {p.manual_pump:+.2f}"
+        return [
+            STATUS_HEADER,
+            f"  SIL t={p.time:.2f}s depth={p.sub.depth:.2f}m {mode}",
+            f"  ticks={self.ticks} overruns={self.overruns} commands={self.commands} dropped={self.dropped}",
+            STATUS_FOOTER,
+        ]
+
+    def _send(self, lines, peers):
+        # One sequence number per payload, so no receiver sees gaps
+        self._tx_seq += 1
+        payload = (f"#{self._tx_seq}\n" + ''.join(line + '\r\n' for line in lines)).encode('ascii')
+        for peer in peers:
+            try:
+                self.sock.sendto(payload, peer)
+            except OSError as e:
+                logger.warning(f"Send to {peer} failed: {e}")
+
+    def tick(self):
+        now = time.monotonic()
+        self._receive(now)
+        while self._pending and self._pending[0][0] <= now:
+            _, received_at, command = self._pending.popleft()
+            self._apply(command)
+            self.actuation_delays.append(now - received_at)
+
+        sample = self.plant.step()
+        self.ticks += 1
+        if self.ticks % self.telem_every == 0:
+            peers = self.telem_to if self.peer is None else [self.peer, *self.telem_to]
+            if peers:
+                fields = ','.join(f"{key},{sample[key]:.4f}" for key in HISTORY_KEYS)
+                self._send([f"TELEM,{fields}"], peers)
+
+    def run(self, duration=None):
+        """Tick on absolute deadlines for duration seconds (forever if None)."""
+        period = self.plant.dt
+        start = next_deadline = time.monotonic()
+        while duration is None or time.monotonic() - start < duration:
+            self.tick()
+            next_deadline += period
+            delay = next_deadline - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                self.overruns += 1
+                next_deadline = time.monotonic()
+
+    def close(self):
+        self.sock.close()
+
+
+def print_metrics(metrics):
+    if metrics is None:
+        print("No autopilot setpoint was commanded, no step response to measure")
+        return
+    for key, value in metrics.items():
+        print(f"  {key:>18}: {value:.3f}" if isinstance(value, float) else f"  {key:>18}: {value}")
+
+
+def parse_address(text):
+    host, _, port = text.rpartition(':')
+    return host or '127.0.0.1', int(port)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--port', type=int, default=5005)
+    parser.add_argument('--rate', type=float, default=20.0, help="plant steps per second")
+    parser.add_argument('--telem-rate', type=float, default=20.0, help="TELEM lines per second")
+    parser.add_argument('--latency', type=float, default=0.0, help="injected command latency (ms)")
+    parser.add_argument('--pump-motor', type=int, default=1)
+    parser.add_argument('--depth-servo', type=int, default=1)
+    parser.add_argument('--max-depth', type=float, default=20.0)
+    parser.add_argument('--telem-to', action='append', default=[], metavar='HOST:PORT',
+                        help="also stream TELEM here (repeatable), e.g. 127.0.0.1:5010 for the dashboard")
+    parser.add_argument('--duration', type=float, help="stop after this many seconds")
+    parser.add_argument('--plot', help="save the run to this image file")
+    parser.add_argument('--sweep', help="comma-separated latencies (ms) to sweep offline")
+    args = parser.parse_args()
+
+    if args.sweep:
+        latencies = [float(x) for x in args.sweep.split(',')]
+        print(f"{'latency ms':>10} {'overshoot':>10} {'settle s':>9} {'ss err':>8} {'IAE':>8} {'osc':>4}")
+        for latency_ms, m in latency_sweep(latencies, dt=1.0 / args.rate):
+            print(f"{latency_ms:>10.0f} {m['overshoot']:>10.3f} {m['settling_time']:>9.2f} "
+                  f"{m['steady_state_error']:>8.3f} {m['iae']:>8.2f} {m['oscillations']:>4}")
+        return
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    server = SilServer(
+        Plant(dt=1.0 / args.rate),
+        host=args.host,
+        port=args.port,
+        latency=args.latency / 1000,
+        telem_rate=args.telem_rate,
+        pump_motor=args.pump_motor,
+        depth_servo=args.depth_servo,
+        max_depth=args.max_depth,
+        telem_to=[parse_address(address) for address in args.telem_to],
+    )
+    logger.info(f"SIL plant on udp://{args.host}:{args.port} at {args.rate:g} Hz, latency {args.latency:g} ms")
+    try:
+        server.run(args.duration)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+
+    delays = server.actuation_delays
+    print(f"{server.ticks} ticks, {server.overruns} overruns, {server.commands} commands, {server.dropped} stale datagrams dropped")
+    if delays:
+        print(f"Command -> plant delay: mean {sum(delays) / len(delays) * 1000:.1f} ms, max {max(delays) * 1000:.1f} ms")
+    print("Depth step response:")
+    print_metrics(stability_metrics(server.plant.history))
+
+    if args.plot:
+        from main import plot_history
+        plot_history(server.plant.history, args.plot)
+
+
+if __name__ == '__main__':
+    main()